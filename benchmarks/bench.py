@@ -0,0 +1,192 @@
+# 性能基准：测量每种数据类型、每个行业预设和每种导出格式在不同行数下的吞吐量和峰值内存
+# 用法：python -m benchmarks.bench [--rows 1000 100000 10000000] [--output results.json] [--compare base.json]
+# 每个用例在独立的子进程中运行，峰值内存（RSS）互不影响；结果保存为 JSON，便于在不同提交之间对比
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from fakedata.presets import default_columns
+from fakedata.writers import EXPORT_FORMATS
+
+DEFAULT_ROWS = [1_000, 100_000, 10_000_000]
+CHUNK_ROWS = 1_000_000
+
+# 逐一测量的数据类型及其列配置
+COLUMN_CASES = {
+    "UUID": {"name": "UUID", "type": "UUID"},
+    "日期": {"name": "日期", "type": "日期"},
+    "姓名": {"name": "姓名", "type": "姓名", "unique_count": 1000},
+    "整数": {"name": "整数", "type": "整数", "min": 0, "max": 1_000_000},
+    "小数": {"name": "小数", "type": "小数", "min": 0.0, "max": 10_000.0},
+    "枚举": {"name": "枚举", "type": "枚举", "custom_values": "已支付, 未支付, 已退款"},
+    "加权枚举": {"name": "加权枚举", "type": "枚举", "custom_values": "已支付:0.9, 未支付:0.08, 已退款:0.02"},
+    "对数正态小数": {"name": "对数正态小数", "type": "小数", "min": 0.0, "max": 10_000.0, "distribution": "lognormal"},
+    "列名": {"name": "列名", "type": "列名", "unique_count": 50},
+    "自增ID": {"name": "自增ID", "type": "自增ID"},
+    "随机ID": {"name": "随机ID", "type": "随机ID"},
+    "UUIDv7": {"name": "UUIDv7", "type": "UUIDv7"},
+    "ULID": {"name": "ULID", "type": "ULID"},
+    "编码": {"name": "编码", "type": "编码", "prefix": "ORD-"},
+}
+
+# 导出用例使用的预设；openpyxl 逐行写出，超过该行数的 xlsx 用例默认跳过
+EXPORT_PRESET = "电商"
+XLSX_MAX_BENCH_ROWS = 1_000_000
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024  # macOS 为字节，Linux 为 KB
+
+
+def _case_specs(group, name):
+    from fakedata.schema import fill_defaults, get_preset
+
+    if group == "column":
+        return fill_defaults([COLUMN_CASES[name]])
+    if group == "preset":
+        return get_preset(name)
+    return get_preset(EXPORT_PRESET)
+
+
+# 在子进程中运行单个用例，通过管道返回耗时和峰值内存
+def _run_case(group, name, num_rows, seed, conn):
+    from fakedata.engine import generate_chunks, prepare_pools
+    from fakedata.writers import write_chunks
+
+    specs = _case_specs(group, name)
+    prepare_pools(specs, seed)  # 预热：首次使用时从磁盘加载或构建数据池，不计入耗时
+    baseline_mb = _peak_rss_mb()
+    chunks = generate_chunks(specs, num_rows, chunk_rows=CHUNK_ROWS, seed=seed)
+    started = time.perf_counter()
+    if group == "export":
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, f"bench{EXPORT_FORMATS[name][1]}")
+            write_chunks(chunks, path, name)
+            output_bytes = os.path.getsize(path)
+    else:
+        output_bytes = None
+        for _ in chunks:
+            pass
+    seconds = time.perf_counter() - started
+    conn.send({
+        "seconds": seconds,
+        "rows_per_sec": num_rows / seconds if seconds else None,
+        "cells_per_sec": num_rows * len(specs) / seconds if seconds else None,
+        "baseline_rss_mb": baseline_mb,
+        "peak_rss_mb": _peak_rss_mb(),
+        "output_bytes": output_bytes,
+    })
+    conn.close()
+
+
+def run_case(group, name, num_rows, seed):
+    ctx = multiprocessing.get_context("spawn")
+    parent_conn, child_conn = ctx.Pipe(duplex=False)
+    process = ctx.Process(target=_run_case, args=(group, name, num_rows, seed, child_conn))
+    process.start()
+    child_conn.close()
+    try:
+        result = parent_conn.recv()
+    except EOFError:
+        result = {"error": f"子进程异常退出，退出码 {process.exitcode}"}
+    process.join()
+    return {"group": group, "name": name, "rows": num_rows, **result}
+
+
+def iter_cases(groups, rows_list, include_slow):
+    for num_rows in rows_list:
+        if "column" in groups:
+            for name in COLUMN_CASES:
+                yield "column", name, num_rows
+        if "preset" in groups:
+            for name in default_columns:
+                yield "preset", name, num_rows
+        if "export" in groups:
+            for name in EXPORT_FORMATS:
+                if name == "xlsx" and num_rows > XLSX_MAX_BENCH_ROWS and not include_slow:
+                    continue
+                yield "export", name, num_rows
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+# 与之前保存的结果对比，列出变慢超过阈值的用例
+def compare(results, base_path, threshold):
+    with open(base_path, encoding="utf-8") as f:
+        base = {(r["group"], r["name"], r["rows"]): r for r in json.load(f)["results"]}
+    regressions = []
+    for result in results:
+        old = base.get((result["group"], result["name"], result["rows"]))
+        if not old or not old.get("rows_per_sec") or not result.get("rows_per_sec"):
+            continue
+        ratio = result["rows_per_sec"] / old["rows_per_sec"]
+        marker = "  <-- 变慢" if ratio < 1 - threshold else ""
+        print(f"{result['group']:>7} {result['name']:<8} {result['rows']:>10}  {ratio:6.2f}x{marker}")
+        if marker:
+            regressions.append(result)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="动态数据生成器性能基准")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS, help="测试的行数")
+    parser.add_argument("--groups", nargs="+", choices=["column", "preset", "export"], default=["column", "preset", "export"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--include-slow", action="store_true", help=f"包含超过 {XLSX_MAX_BENCH_ROWS} 行的 xlsx 导出")
+    parser.add_argument("--output", help="结果文件路径，默认为 benchmarks/results/<提交>.json")
+    parser.add_argument("--compare", help="与之前的结果文件对比")
+    parser.add_argument("--threshold", type=float, default=0.1, help="判定为变慢的吞吐量下降比例")
+    args = parser.parse_args(argv)
+
+    commit = _git_commit()
+    results = []
+    for group, name, num_rows in iter_cases(args.groups, args.rows, args.include_slow):
+        result = run_case(group, name, num_rows, args.seed)
+        results.append(result)
+        if "error" in result:
+            print(f"{group:>7} {name:<8} {num_rows:>10}  {result['error']}", file=sys.stderr)
+        else:
+            print(
+                f"{group:>7} {name:<8} {num_rows:>10}  {result['rows_per_sec']:>14,.0f} 行/秒"
+                f"  峰值内存 {result['peak_rss_mb']:8.1f} MB",
+                file=sys.stderr,
+            )
+
+    output = Path(args.output or Path(__file__).parent / "results" / f"{commit}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    report = {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "chunk_rows": CHUNK_ROWS,
+        "results": results,
+    }
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"结果已保存到 {output}", file=sys.stderr)
+
+    if args.compare:
+        return 1 if compare(results, args.compare, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+# 动态数据生成器的核心库，可脱离 Streamlit 单独使用
@@ -0,0 +1,5 @@
+import sys
+
+from fakedata.cli import main
+
+sys.exit(main())
@@ -0,0 +1,108 @@
+# 进程内共享的数据集缓存：以列配置、行数和种子的规范化哈希为键，按 LRU 淘汰
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+
+from fakedata.engine import parse_custom_values
+from fakedata.pools import POOL_VERSION
+
+# 默认内存预算（MB），可通过环境变量 FAKEDATA_CACHE_MB 调整
+DEFAULT_CACHE_MB = int(os.environ.get("FAKEDATA_CACHE_MB", "512"))
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"无法序列化的配置值: {value!r}")
+
+
+# 计算数据集的缓存键：同样的列配置、行数、种子和语言区域得到同样的键
+def dataset_key(specs, num_rows, seed, locale="zh_CN"):
+    canonical_specs = []
+    for spec in specs:
+        spec = dict(spec)
+        if spec.get("type") == "枚举" and "custom_values" in spec:
+            # 只有枚举值按逗号拆分后比较；公式、编码前缀等其他类型的文本原样计入，逗号和空格都有意义
+            spec["custom_values"] = parse_custom_values(spec["custom_values"])
+        canonical_specs.append(spec)
+    payload = json.dumps(
+        {"specs": canonical_specs, "rows": num_rows, "seed": seed, "locale": locale, "pools": POOL_VERSION},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=_json_default,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# 单列的缓存键：只取决于这一列自己的配置，与表中其他列无关；公式列通过 inputs 传入它引用的列的配置
+def column_key(spec, num_rows, seed, locale="zh_CN", inputs=()):
+    return ("column", dataset_key([spec, *inputs], num_rows, seed, locale))
+
+
+# 估算缓存值占用的内存字节数（DataFrame 或 Series）
+def _size_of(value):
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if hasattr(value, "memory_usage"):
+        usage = value.memory_usage(index=True, deep=True)
+        return int(usage.sum() if hasattr(usage, "sum") else usage)
+    return 0
+
+
+# 线程安全的 LRU 缓存，同时存放生成的 DataFrame、单列数据和导出的文件字节
+# 缓存中的 DataFrame 会被多个会话共享，取出后不要原地修改
+class DatasetCache:
+    def __init__(self, max_bytes=DEFAULT_CACHE_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # 键 -> (值, 字节数)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        size = _size_of(value)
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                return value  # 超过整个预算的值不缓存
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+        return value
+
+    # 命中时直接返回缓存值，否则调用 factory 生成并放入缓存
+    # factory 在锁外执行，生成大表时不会阻塞其他会话读取缓存
+    def get_or_create(self, key, factory):
+        value = self.get(key)
+        if value is None:
+            value = self.put(key, factory())
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    @property
+    def size_bytes(self):
+        return self._bytes
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,507 @@
+# 列式数据生成引擎：每一列通过一次批量的 NumPy 调用生成，而不是逐行逐单元格生成
+import hashlib
+import math
+import re
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+from fakedata.expressions import FORMULA, evaluate_expression, evaluation_order, expression_inputs
+from fakedata.metrics import NULL_PROFILER, memory_of
+from fakedata.pools import get_pool_store
+from fakedata.presets import RANDOM_ID_MAX
+
+# 需要从数据池中抽取独特数据的列类型，以及对应的 Faker 数据提供者
+POOL_PROVIDERS = {
+    "姓名": "name",
+    "公司": "company",
+    "城市": "city",
+    "国家": "country",
+}
+
+# 由行号计算、保证唯一的ID类型
+UNIQUE_ID_TYPES = ["自增ID", "随机ID", "UUIDv7", "ULID", "编码"]
+
+# 数据池抽样使用的独立随机流编号，不会与行块序号冲突
+_POOL_STREAM = 2**32
+
+# 随机流按固定大小的全局行块划分：第 b 个行块覆盖整张表的第 b * RNG_BLOCK_ROWS 行起的 RNG_BLOCK_ROWS 行，
+# 最后一个行块在表尾截止。每个值只取决于主种子、列名、行号和总行数，与 chunk_rows 以及分块由哪个进程生成都无关
+# 默认的分块行数（10 万、5 万）都是它的整数倍，分块边界与行块对齐时不需要额外生成任何行
+RNG_BLOCK_ROWS = 10_000
+
+# UUID 字符串中十六进制字符所在的位置（其余位置为 "-"）
+_UUID_HEX_POS = np.array([i for i in range(36) if i not in (8, 13, 18, 23)])
+_HEX_CHARS = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+
+# ULID 使用的 Crockford Base32 字母表
+_CROCKFORD = np.frombuffer(b"0123456789ABCDEFGHJKMNPQRSTVWXYZ", dtype=np.uint8)
+
+# 随机ID 使用的 Feistel 置换轮数
+_FEISTEL_ROUNDS = 4
+
+# 形如 09:00 或 18:45:30 的时刻，不会被当作“取值:权重”
+_CLOCK_TIME = re.compile(r"^\d{1,2}[:：][0-5]\d([:：][0-5]\d)?$")
+
+
+# 将逗号或顿号分隔的枚举字符串解析为列表
+def parse_custom_values(custom_values):
+    if custom_values is None:
+        return None
+    if isinstance(custom_values, str):
+        custom_values = custom_values.replace("，", ",").replace("、", ",").split(",")
+    return [str(val).strip() for val in custom_values if str(val).strip()]
+
+
+# 解析带权重的枚举值，例如“已支付:0.9, 未支付:0.1”
+# 只有每个值都以“:数字”结尾时才按权重抽取，否则冒号视为取值本身的一部分；全部是 09:00 这样的时刻时也不视为权重
+# 返回 (取值列表, 权重数组)，不带权重时权重为 None，表示均匀抽取
+def parse_weighted_values(custom_values):
+    items = parse_custom_values(custom_values) or []
+    values = []
+    weights = []
+    for item in items:
+        value, sep, weight = item.replace("：", ":").rpartition(":")
+        try:
+            weights.append(float(weight))
+        except ValueError:
+            return items, None
+        if not sep or not value.strip():
+            return items, None
+        values.append(value.strip())
+    if not items or all(_CLOCK_TIME.match(item) for item in items):
+        return items, None
+    return values, np.array(weights)
+
+
+# Vose 别名表：预处理 O(n)，之后每次抽取只需一次均匀整数和一次均匀小数，与取值个数无关
+def alias_table(weights):
+    weights = np.asarray(weights, dtype=float)
+    if (weights < 0).any() or weights.sum() <= 0:
+        raise ValueError("枚举权重必须为非负数且不能全为 0")
+    count = len(weights)
+    prob = weights * count / weights.sum()
+    alias = np.zeros(count, dtype=np.int64)
+    small = [i for i in range(count) if prob[i] < 1.0]
+    large = [i for i in range(count) if prob[i] >= 1.0]
+    while small and large:
+        less, more = small.pop(), large.pop()
+        alias[less] = more
+        prob[more] -= 1.0 - prob[less]
+        (small if prob[more] < 1.0 else large).append(more)
+    prob[small + large] = 1.0  # 浮点误差导致剩余的项
+    return prob, alias
+
+
+# 用别名表批量抽取 num_rows 个下标
+def alias_draw(table, num_rows, rng):
+    prob, alias = table
+    picks = rng.integers(0, len(prob), size=num_rows)
+    return np.where(rng.random(num_rows) < prob[picks], picks, alias[picks])
+
+
+# 将界面中按列拆开的配置合并为列配置字典列表，格式与 default_columns 一致
+def build_specs(columns, column_types, min_vals, max_vals, custom_values, unique_counts, date_ranges, distributions=None):
+    specs = []
+    for col_name, col_type, min_val, max_val, custom_val, unique_count, date_range, distribution in zip(
+        columns, column_types, min_vals, max_vals, custom_values, unique_counts, date_ranges,
+        distributions or [None] * len(columns),
+    ):
+        start_date, end_date = date_range if date_range else (None, None)
+        specs.append({
+            "name": col_name,
+            "type": col_type,
+            "min": min_val,
+            "max": max_val,
+            "custom_values": custom_val,
+            "unique_count": unique_count,
+            "start_date": start_date,
+            "end_date": end_date,
+            "distribution": distribution,
+        })
+    return specs
+
+
+# 由列名得到稳定的随机流编号：每列使用独立的随机流，修改、增加或删除某一列不会改变其他列的数据
+def column_stream(name):
+    return int.from_bytes(hashlib.sha256(str(name).encode("utf-8")).digest()[:8], "little")
+
+
+# 为姓名、公司、城市、国家列从持久化数据池中不放回地抽取独特数据，每列使用由主种子和列名派生的随机流
+# 列配置中的 locale 优先于整张表的语言区域；随机ID 列在这里抽取各分块共用的置换密钥
+def build_pools(specs, seed, locale="zh_CN"):
+    store = get_pool_store()
+    pools = {}
+    for spec in specs:
+        rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(_POOL_STREAM, column_stream(spec["name"]))))
+        if spec["type"] == "随机ID":
+            pools[spec["name"]] = rng.integers(0, 2**64, size=_FEISTEL_ROUNDS, dtype=np.uint64)
+            continue
+        if spec["type"] == "枚举":
+            _, weights = parse_weighted_values(spec.get("custom_values"))
+            if weights is not None:
+                pools[spec["name"]] = alias_table(weights)  # 各分块共用预先构建的别名表
+            continue
+        provider = POOL_PROVIDERS.get(spec["type"])
+        unique_count = spec.get("unique_count")
+        if provider is not None and unique_count is not None:
+            pools[spec["name"]] = store.sample(provider, spec.get("locale", locale), unique_count, rng)
+    return pools
+
+
+def _to_day(value):
+    if isinstance(value, datetime):
+        value = value.date()
+    if isinstance(value, date):
+        return np.datetime64(value, "D")
+    return np.datetime64(str(value), "D")
+
+
+# 十六进制字符到数值的查找表（大小写均可）
+_HEX_VALUES = np.zeros(256, dtype=np.uint8)
+_HEX_VALUES[_HEX_CHARS] = np.arange(16)
+_HEX_VALUES[np.frombuffer(b"ABCDEF", dtype=np.uint8)] = np.arange(10, 16)
+
+
+# 将 (n, 16) 的 uint8 数组批量格式化为 UUID 字符串
+def format_uuids(raw):
+    num_rows = len(raw)
+    nibbles = np.empty((num_rows, 32), dtype=np.uint8)
+    nibbles[:, 0::2] = raw >> 4
+    nibbles[:, 1::2] = raw & 0x0F
+    text = np.full((num_rows, 36), ord("-"), dtype=np.uint8)
+    text[:, _UUID_HEX_POS] = _HEX_CHARS[nibbles]
+    return text.view("S36").ravel().astype("U36")
+
+
+# format_uuids 的逆操作：把 UUID 字符串批量解析为 (n, 16) 的 uint8 数组
+def parse_uuids(values):
+    text = np.asarray(values, dtype="S36").view(np.uint8).reshape(-1, 36)
+    nibbles = _HEX_VALUES[text[:, _UUID_HEX_POS]]
+    return (nibbles[:, 0::2] << 4) | nibbles[:, 1::2]
+
+
+# 批量生成 UUID4 字符串：一次取出全部随机字节，再按位设置版本号并转为十六进制
+def _uuid_strings(rng, num_rows):
+    raw = np.frombuffer(rng.bytes(16 * num_rows), dtype=np.uint8).reshape(num_rows, 16).copy()
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40  # 版本 4
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80  # RFC 4122 变体
+    return format_uuids(raw)
+
+
+# 带密钥的 Feistel 网络：在 [0, 2^bits) 上的双射，输入互不相同时输出也互不相同
+def _feistel(values, keys, half_bits):
+    shift = np.uint64(half_bits)
+    mask = np.uint64((1 << half_bits) - 1)
+    left = values >> shift
+    right = values & mask
+    for key in keys:
+        mixed = right * np.uint64(0x9E3779B97F4A7C15) + key
+        mixed ^= mixed >> np.uint64(29)
+        mixed *= np.uint64(0xBF58476D1CE4E5B9)
+        mixed ^= mixed >> np.uint64(32)
+        left, right = right, left ^ (mixed & mask)
+    return (left << shift) | right
+
+
+# 把行号一一映射到 [0, domain) 中看似随机的整数：超出范围的结果继续置换（cycle walking），
+# 直到落入范围内，因此映射仍是双射，各分块无需共享已用集合也不会重复
+def permute_ids(rows, domain, keys):
+    bits = max(2, int(domain - 1).bit_length())
+    half_bits = (bits + 1) // 2
+    values = _feistel(rows.astype(np.uint64), keys, half_bits)
+    outside = values >= np.uint64(domain)
+    while outside.any():
+        values[outside] = _feistel(values[outside], keys, half_bits)
+        outside = values >= np.uint64(domain)
+    return values.astype(np.int64)
+
+
+# 把毫秒时间戳按大端序写入前 6 个字节，UUIDv7 和 ULID 共用这一布局
+def _timestamped_bytes(rng, timestamps):
+    num_rows = len(timestamps)
+    raw = np.frombuffer(rng.bytes(16 * num_rows), dtype=np.uint8).reshape(num_rows, 16).copy()
+    raw[:, :6] = timestamps.astype(">u8").view(np.uint8).reshape(num_rows, 8)[:, 2:]
+    return raw
+
+
+# 将 (n, 16) 的 uint8 数组批量编码为 26 个字符的 ULID 字符串
+def format_ulids(raw):
+    num_rows = len(raw)
+    bits = np.concatenate([np.zeros((num_rows, 2), dtype=np.uint8), np.unpackbits(raw, axis=1)], axis=1)
+    digits = bits.reshape(num_rows, 26, 5) @ np.array([16, 8, 4, 2, 1], dtype=np.uint8)
+    return np.ascontiguousarray(_CROCKFORD[digits]).view("S26").ravel().astype("U26")
+
+
+# 以 16 字节的 bytes 对象返回，写出 Parquet / Arrow 时为二进制列，体积不到字符串的一半
+def _binary_values(raw):
+    data = raw.tobytes()
+    values = np.empty(len(raw), dtype=object)
+    values[:] = [data[i:i + 16] for i in range(0, len(data), 16)]
+    return values
+
+
+# UUIDv7 / ULID 的时间戳：从 start_date 开始每行递增 1 毫秒，行号不同时间戳就不同，保证唯一且按行有序
+def _row_timestamps(spec, rows):
+    start_date = spec.get("start_date") or date(date.today().year, 1, 1)
+    start_ms = _to_day(start_date).astype("datetime64[ms]").astype(np.int64)
+    return start_ms + rows
+
+
+# 以“编码 + 字典”的形式构建分类列：values 为可选取值，codes 为每行选中的下标
+# 重复的取值会被合并，各分块使用同一个字典，拼接后仍是同一种分类类型
+def _categorical(values, codes):
+    value_codes, categories = pd.factorize(np.asarray(values, dtype=object))
+    return pd.Categorical.from_codes(value_codes[codes], categories=categories)
+
+
+# 生成单列数据，返回长度为 num_rows 的数组；取值有限的列返回 pd.Categorical
+# offset 为本分块第一行在整张表中的行号，唯一ID类型由行号计算，跨分块、跨进程都不会重复
+# columns 为同一分块中已生成的列，公式列从中读取它引用的列
+def generate_column(spec, num_rows, rng, pools, offset=0, columns=None):
+    col_name = spec["name"]
+    col_type = spec["type"]
+    if col_type == FORMULA:
+        return evaluate_expression(spec, columns or {}, num_rows, rng)
+    if col_type in UNIQUE_ID_TYPES:
+        return _unique_ids(spec, np.arange(offset, offset + num_rows, dtype=np.int64), rng, pools)
+    if col_type == "列名":
+        unique_count = spec.get("unique_count") or 1
+        unique_data = [f"{col_name}{i}" for i in range(1, unique_count + 1)]
+        return _categorical(unique_data, rng.integers(0, unique_count, size=num_rows))
+    elif col_type == "枚举":
+        custom_val, weights = parse_weighted_values(spec.get("custom_values"))
+        if not custom_val:  # 如果没有输入值，默认为 None
+            return np.full(num_rows, None, dtype=object)
+        if weights is None:
+            return _categorical(custom_val, rng.integers(0, len(custom_val), size=num_rows))
+        table = pools[col_name] if col_name in pools else alias_table(weights)
+        return _categorical(custom_val, alias_draw(table, num_rows, rng))
+    elif col_type == "日期":
+        start_date, end_date = spec.get("start_date"), spec.get("end_date")
+        if not (start_date and end_date):
+            return np.full(num_rows, None, dtype=object)
+        start_day = _to_day(start_date)
+        span = int((_to_day(end_date) - start_day).astype(int))
+        days = start_day + rng.integers(0, span, size=num_rows, endpoint=True)
+        return np.datetime_as_string(days, unit="D").astype(object)
+    elif col_type in POOL_PROVIDERS:
+        pool = pools[col_name]
+        return _categorical(pool, rng.integers(0, len(pool), size=num_rows))  # 从预生成的独特数据中随机抽取
+    elif col_type == "整数":
+        if (spec.get("distribution") or "uniform") == "uniform":
+            return rng.integers(int(spec["min"]), int(spec["max"]), size=num_rows, endpoint=True)
+        return np.rint(_distributed_values(spec, num_rows, rng)).astype(np.int64)
+    elif col_type == "小数":
+        if (spec.get("distribution") or "uniform") == "uniform":
+            return np.round(rng.uniform(spec["min"], spec["max"], size=num_rows), 2)  # 保留两位小数
+        return np.round(_distributed_values(spec, num_rows, rng), 2)
+    elif col_type == "UUID":
+        return _uuid_strings(rng, num_rows).astype(object)
+    raise ValueError(f"不支持的数据类型: {col_type}")
+
+
+# 按 distribution 批量抽取数值并截断到 [min, max]；未指定的参数由取值范围推算
+#   normal：mean（默认为范围中点）、std（默认为范围的 1/6）
+#   lognormal：median（默认为范围两端的几何平均数）、sigma（默认为 1）
+#   zipf：a（默认为 2），min 出现得最多，越大越少
+#   poisson：mean（默认为范围中点）
+def _distributed_values(spec, num_rows, rng):
+    low, high = spec["min"], spec["max"]
+    distribution = spec["distribution"]
+    if distribution == "normal":
+        values = rng.normal(spec.get("mean", (low + high) / 2), spec.get("std", (high - low) / 6), size=num_rows)
+    elif distribution == "lognormal":
+        median = spec.get("median", math.sqrt(max(low, 1) * max(high, 1)))
+        values = rng.lognormal(math.log(median), spec.get("sigma", 1.0), size=num_rows)
+    elif distribution == "zipf":
+        values = low + (rng.zipf(spec.get("a", 2.0), size=num_rows) - 1)
+    elif distribution == "poisson":
+        values = low + rng.poisson(spec.get("mean", (low + high) / 2) - low, size=num_rows)
+    else:
+        raise ValueError(f"不支持的分布: {distribution}")
+    return np.clip(values, low, high)
+
+
+# 由行号生成唯一ID列
+def _unique_ids(spec, rows, rng, pools):
+    col_type = spec["type"]
+    if col_type == "自增ID":
+        return int(spec.get("min", 1)) + rows * int(spec.get("step", 1))
+    if col_type == "随机ID":
+        low, high = int(spec.get("min", 1)), int(spec.get("max", RANDOM_ID_MAX))
+        if len(rows) and rows[-1] > high - low:
+            raise ValueError(f"{spec['name']} 的取值范围小于行数，无法保证唯一")
+        return low + permute_ids(rows, high - low + 1, pools[spec["name"]])
+    if col_type == "编码":
+        numbers = (int(spec.get("min", 1)) + rows).astype(str)
+        prefix = spec.get("prefix") or spec.get("custom_values") or ""
+        return np.char.add(prefix, np.char.zfill(numbers, int(spec.get("width", 9)))).astype(object)
+    raw = _timestamped_bytes(rng, _row_timestamps(spec, rows))
+    if col_type == "UUIDv7":
+        raw[:, 6] = (raw[:, 6] & 0x0F) | 0x70  # 版本 7
+        raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80  # RFC 4122 变体
+        return _binary_values(raw) if spec.get("binary") else format_uuids(raw).astype(object)
+    return _binary_values(raw) if spec.get("binary") else format_ulids(raw).astype(object)
+
+
+# 生成前检查列配置能否生成 num_rows 行，不能时抛出 ValueError；流式服务在发送响应头之前调用，避免生成到一半才出错
+def check_specs(specs, num_rows):
+    evaluation_order(specs)
+    for spec in specs:
+        col_type = spec["type"]
+        try:
+            if col_type in ("整数", "小数") and float(spec["min"]) > float(spec["max"]):
+                raise ValueError(f"列 {spec['name']} 的最小值大于最大值")
+            if col_type == "随机ID" and int(spec["max"]) - int(spec["min"]) + 1 < num_rows:
+                raise ValueError(f"{spec['name']} 的取值范围小于行数，无法保证唯一")
+            if col_type == "日期" and spec.get("start_date") and spec.get("end_date"):
+                if _to_day(spec["start_date"]) > _to_day(spec["end_date"]):
+                    raise ValueError(f"列 {spec['name']} 的开始日期晚于结束日期")
+            if col_type in ("UUIDv7", "ULID") and spec.get("start_date"):
+                _to_day(spec["start_date"])
+            weights = parse_weighted_values(spec.get("custom_values"))[1] if col_type == "枚举" else None
+            if weights is not None and ((weights < 0).any() or weights.sum() <= 0):
+                raise ValueError(f"列 {spec['name']} 的枚举权重必须为非负数且不能全为 0")
+        except (TypeError, KeyError) as e:
+            raise ValueError(f"列 {spec['name']} 的配置无效: {e}") from None
+
+
+# 未指定种子时随机选取一个主种子，之后所有行块的种子都由它派生
+def resolve_seed(seed):
+    return np.random.SeedSequence().entropy if seed is None else seed
+
+
+# 用主种子从数据池中抽取各列的独特数据（整个生成过程只抽取一次）
+def prepare_pools(specs, seed, locale="zh_CN", profiler=NULL_PROFILER):
+    with profiler.measure("pools"):
+        return build_pools(specs, seed, locale)
+
+
+# 第 block 个行块中某一列的随机数生成器，由主种子、行块序号和列名派生
+# 一列的数据只取决于它自己的配置、主种子和行号，与其他列无关
+def column_rng(seed, block, name):
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(block, column_stream(name))))
+
+
+# 与 [offset, offset + num_rows) 相交的行块：[(行块序号, 起始行号, 行数)]，最后一个行块在 total_rows 处截止
+# num_rows 为 0 时返回一个空行块，各列仍按类型生成长度为 0 的数组
+def row_blocks(offset, num_rows, total_rows):
+    first = offset // RNG_BLOCK_ROWS
+    if num_rows <= 0:
+        return [(first, offset, 0)]
+    last = (offset + num_rows - 1) // RNG_BLOCK_ROWS
+    return [
+        (block, block * RNG_BLOCK_ROWS, min(RNG_BLOCK_ROWS, total_rows - block * RNG_BLOCK_ROWS))
+        for block in range(first, last + 1)
+    ]
+
+
+# 拼接各行块生成的同一列；同一列的分类数据使用同一个字典，拼接后仍是分类类型
+def concat_blocks(parts):
+    if len(parts) == 1:
+        return parts[0]
+    if isinstance(parts[0], pd.Categorical):
+        return pd.api.types.union_categoricals(parts)
+    return np.concatenate(parts)
+
+
+# 将总行数切分为若干分块的行数
+def chunk_sizes(num_rows, chunk_rows):
+    if chunk_rows < 1:
+        raise ValueError("chunk_rows 必须大于 0")
+    return [min(chunk_rows, num_rows - start) for start in range(0, num_rows, chunk_rows)]
+
+
+# 分块的起始行号
+def chunk_offsets(sizes):
+    return np.concatenate([[0], np.cumsum(sizes[:-1], dtype=np.int64)]).tolist() if sizes else []
+
+
+# 按行块逐块生成一列并拼接，blocks 为 row_blocks 的结果；传入 Profiler 时记录生成耗时和结果占用的内存
+# columns 为同一行范围中已生成的列，公式列按行块切片读取
+def build_column(spec, seed, blocks, pools, profiler=NULL_PROFILER, columns=None):
+    start = blocks[0][1]
+    num_rows = sum(rows for _, _, rows in blocks)
+    with profiler.measure("cells", spec["name"], num_rows) as entry:
+        parts = []
+        for block, block_start, block_rows in blocks:
+            inputs = None
+            if spec["type"] == FORMULA:
+                begin = block_start - start
+                inputs = {name: values[begin:begin + block_rows] for name, values in (columns or {}).items()}
+            rng = column_rng(seed, block, spec["name"])
+            parts.append(generate_column(spec, block_rows, rng, pools, block_start, inputs))
+        values = concat_blocks(parts)
+        if entry is not None:
+            entry["bytes"] = memory_of(values)
+    return values
+
+
+# 生成总共 total_rows 行的表中从 offset 开始的 num_rows 行：逐列批量生成后一次性构建 DataFrame
+# 先生成分块所在的完整行块，再切出本分块的行，因此分块的切分方式不影响生成的数据
+# 公式列在它引用的列之后计算，DataFrame 中的列仍按配置的顺序排列
+def build_chunk(specs, num_rows, seed, pools, profiler=NULL_PROFILER, offset=0, total_rows=None):
+    blocks = row_blocks(offset, num_rows, offset + num_rows if total_rows is None else total_rows)
+    begin = offset - blocks[0][1]
+    data = {}
+    for spec in evaluation_order(specs):
+        data[spec["name"]] = build_column(spec, seed, blocks, pools, profiler, data)
+    with profiler.measure("frame", "", num_rows):
+        return pd.DataFrame({spec["name"]: data[spec["name"]][begin:begin + num_rows] for spec in specs})
+
+
+# 按列配置生成整张表
+# 传入 column_cache（如 DatasetCache）时按列缓存：只生成配置变化或新增的列，其余列直接复用
+def generate_frame(specs, num_rows, seed=None, locale="zh_CN", profiler=NULL_PROFILER, column_cache=None, on_column=None):
+    seed = resolve_seed(seed)
+    if column_cache is None:
+        pools = prepare_pools(specs, seed, locale, profiler)
+        return build_chunk(specs, num_rows, seed, pools, profiler)
+
+    from fakedata.cache import column_key
+
+    # 公式列的缓存键还包含它所引用的列的配置，被引用的列变化时公式列随之重新计算
+    ordered = evaluation_order(specs)
+    keys = [
+        column_key(spec, num_rows, seed, locale, expression_inputs(spec, specs) if spec["type"] == FORMULA else ())
+        for spec in ordered
+    ]
+    columns = [column_cache.get(key) for key in keys]
+    missing = [spec for spec, column in zip(ordered, columns) if column is None]
+    pools = prepare_pools(missing, seed, locale, profiler) if missing else {}
+    data = {}
+    for done, (spec, key, column) in enumerate(zip(ordered, keys, columns)):
+        if on_column is not None:
+            on_column(done, len(ordered))  # 每列之前回调，后台任务据此更新进度并检查是否已取消
+        if column is None:
+            inputs = {name: series.values for name, series in data.items()}
+            values = build_column(spec, seed, row_blocks(0, num_rows, num_rows), pools, profiler, inputs)
+            column = column_cache.put(key, pd.Series(values, copy=False))
+        data[spec["name"]] = column
+    with profiler.measure("frame", "", num_rows):
+        # 直接引用缓存中的列，不复制数据，整张表不会在缓存之外再占一份内存
+        return pd.DataFrame({spec["name"]: data[spec["name"]] for spec in specs}, copy=False)
+
+
+# 分块流式生成：每次产出 chunk_rows 行的 DataFrame，峰值内存与总行数无关，生成的数据与 chunk_rows 无关
+# 独特数据池只构建一次，所有分块共用，保证各分块中的分类列取值一致
+def generate_chunks(specs, num_rows, chunk_rows=100_000, seed=None, locale="zh_CN", profiler=NULL_PROFILER):
+    sizes = chunk_sizes(num_rows, chunk_rows)
+    seed = resolve_seed(seed)
+    pools = prepare_pools(specs, seed, locale, profiler)
+    for rows, offset in zip(sizes, chunk_offsets(sizes)):
+        yield build_chunk(specs, rows, seed, pools, profiler, offset, num_rows)
+
+
+# 数据生成函数
+def generate_data(columns, column_types, min_vals, max_vals, custom_values, unique_counts, date_ranges, num_rows, seed=None):
+    specs = build_specs(columns, column_types, min_vals, max_vals, custom_values, unique_counts, date_ranges)
+    return generate_frame(specs, num_rows, seed=seed)
+
+
+# 分块版本的数据生成函数，参数与 generate_data 相同
+def generate_data_chunks(columns, column_types, min_vals, max_vals, custom_values, unique_counts, date_ranges, num_rows, chunk_rows=100_000, seed=None):
+    specs = build_specs(columns, column_types, min_vals, max_vals, custom_values, unique_counts, date_ranges)
+    return generate_chunks(specs, num_rows, chunk_rows=chunk_rows, seed=seed)
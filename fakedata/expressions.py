@@ -0,0 +1,318 @@
+# 公式列：由同一行其他列的值计算得到，例如 `购买数量 * 单价`、`发货日期 + randint(1, 7) days`
+# 表达式按 Python 语法解析为语法树，只允许白名单中的运算和函数；求值时每个节点对整列数组做一次向量化运算，不逐行执行 Python
+# 列名可以直接书写（中文列名是合法的标识符），包含空格或符号的列名用反引号括起来，例如 `订单 金额`
+import ast
+import re
+from functools import lru_cache
+
+import numpy as np
+
+# 公式列的数据类型
+FORMULA = "公式"
+
+# 天数单位：“N days” 或 “N 天” 改写为与该名称相乘，求值时为 _DAY_UNIT
+_DAYS = "__days__"
+_DAY_UNIT = object()
+
+# 依次匹配反引号列名、字符串常量和天数单位；单位前可以不加空格，例如 3天、(n + 1)days
+_TOKEN = re.compile(r"`([^`]*)`|('(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\")|(?:\b|(?<=[\d)]))(?:days?\b|天(?!\w))")
+
+_BINARY_OPS = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: np.true_divide,
+    ast.FloorDiv: np.floor_divide,
+    ast.Mod: np.mod,
+    ast.Pow: np.power,
+    ast.BitAnd: np.logical_and,
+    ast.BitOr: np.logical_or,
+}
+
+_COMPARE_OPS = {
+    ast.Eq: np.equal,
+    ast.NotEq: np.not_equal,
+    ast.Lt: np.less,
+    ast.LtE: np.less_equal,
+    ast.Gt: np.greater,
+    ast.GtE: np.greater_equal,
+}
+
+# 可调用的函数：函数名 -> (最少参数个数, 最多参数个数)
+FUNCTIONS = {
+    "randint": (2, 2),  # 闭区间内的随机整数
+    "uniform": (2, 2),  # 区间内的随机小数
+    "normal": (2, 2),  # 正态分布随机数（均值, 标准差）
+    "round": (1, 2),
+    "abs": (1, 1),
+    "min": (2, 2),  # 逐行取较小值
+    "max": (2, 2),  # 逐行取较大值
+    "where": (3, 3),  # where(条件, 条件成立时的值, 否则的值)
+}
+
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.USub, ast.UAdd, ast.Invert, ast.Compare,
+    ast.Call, ast.Name, ast.Load, ast.Constant,
+    *_BINARY_OPS, *_COMPARE_OPS,
+)
+
+
+# 解析后的表达式：tree 为语法树，columns 为引用的列名（按首次出现的顺序）
+class Expression:
+    def __init__(self, text, tree, names):
+        self.text = text
+        self.tree = tree
+        self.names = names  # 语法树中的标识符 -> 列名
+        self.columns = list(dict.fromkeys(names.values()))
+
+
+# 解析并校验表达式；同一表达式在各分块中只解析一次
+@lru_cache(maxsize=256)
+def compile_expression(text):
+    if not text or not str(text).strip():
+        raise ValueError("公式不能为空")
+    quoted = {}
+
+    def replace(match):
+        if match.group(1) is not None:
+            placeholder = f"__col{len(quoted)}__"
+            quoted[placeholder] = match.group(1)
+            return placeholder
+        if match.group(2) is not None:
+            return match.group(2)
+        return f"* {_DAYS}"
+
+    source = _TOKEN.sub(replace, str(text).strip())
+    try:
+        tree = ast.parse(source, mode="eval")
+    except SyntaxError:
+        raise ValueError(f"公式语法错误: {text}") from None
+    names = {}
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ValueError(f"公式中不支持的写法: {ast.unparse(node) if isinstance(node, ast.expr) else type(node).__name__}")
+        if isinstance(node, ast.Call):
+            name = node.func.id if isinstance(node.func, ast.Name) else None
+            if name not in FUNCTIONS or node.keywords:
+                raise ValueError(f"公式中不支持的函数: {ast.unparse(node.func)}（可用: {', '.join(FUNCTIONS)}）")
+            least, most = FUNCTIONS[name]
+            if not least <= len(node.args) <= most:
+                raise ValueError(f"函数 {name} 的参数个数不正确")
+        elif isinstance(node, ast.Compare) and len(node.ops) > 1:
+            raise ValueError("公式中的比较不能连写，请用 & 连接")
+        elif isinstance(node, ast.Constant) and not isinstance(node.value, (int, float, str)):
+            raise ValueError(f"公式中不支持的常量: {node.value!r}")
+    calls = {id(node.func) for node in ast.walk(tree) if isinstance(node, ast.Call)}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and id(node) not in calls and node.id != _DAYS:
+            names[node.id] = quoted.get(node.id, node.id)
+    return Expression(text, tree, names)
+
+
+def _expression_text(spec):
+    return spec.get("expression") or spec.get("custom_values")
+
+
+# 公式列依赖的列名
+def expression_columns(spec):
+    return compile_expression(_expression_text(spec)).columns
+
+
+# 按依赖关系排序列配置：公式列排在它引用的列之后，其余列保持原顺序
+def evaluation_order(specs):
+    by_name = {spec["name"]: spec for spec in specs}
+    ordered = []
+    done = set()
+    visiting = set()
+
+    def visit(spec):
+        if spec["name"] in done:
+            return
+        if spec["name"] in visiting:
+            raise ValueError(f"公式列之间存在循环引用: {spec['name']}")
+        visiting.add(spec["name"])
+        if spec["type"] == FORMULA:
+            for column in expression_columns(spec):
+                if column not in by_name:
+                    raise ValueError(f"公式列 {spec['name']} 引用了不存在的列: {column}")
+                visit(by_name[column])
+        visiting.discard(spec["name"])
+        done.add(spec["name"])
+        ordered.append(spec)
+
+    for spec in specs:
+        visit(spec)
+    return ordered
+
+
+# 公式列直接和间接依赖的列配置，用于按列缓存时计算缓存键
+def expression_inputs(spec, specs):
+    by_name = {s["name"]: s for s in specs}
+    inputs = {}
+    pending = list(expression_columns(spec))
+    while pending:
+        name = pending.pop()
+        if name in inputs or name not in by_name:
+            continue
+        inputs[name] = by_name[name]
+        if by_name[name]["type"] == FORMULA:
+            pending.extend(expression_columns(by_name[name]))
+    return [inputs[name] for name in sorted(inputs)]
+
+
+# 把 ISO 格式的日期字符串列转换为 datetime64[D]，空值转换为 NaT
+def _as_dates(values):
+    if _is_text(values):
+        return values.astype("datetime64[D]")
+    return values
+
+
+# 数组或 NumPy 标量的类型代码，Python 常量返回空字符串
+def _kind(values):
+    return values.dtype.kind if isinstance(values, (np.ndarray, np.generic)) else ""
+
+
+def _is_text(values):
+    return _kind(values) in ("O", "U")
+
+
+def _is_days(values):
+    return _kind(values) == "m"
+
+
+# 日期或天数：与之运算的字符串列按日期解析
+def _is_temporal(values):
+    return _kind(values) in ("m", "M")
+
+
+class _Evaluator:
+    def __init__(self, expression, columns, num_rows, rng):
+        self.expression = expression
+        self.columns = columns
+        self.num_rows = num_rows
+        self.rng = rng
+
+    def eval(self, node):
+        if isinstance(node, ast.Expression):
+            return self.eval(node.body)
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, ast.Name):
+            if node.id == _DAYS:
+                return _DAY_UNIT
+            return np.asarray(self.columns[self.expression.names[node.id]])
+        if isinstance(node, ast.UnaryOp):
+            operand = self.eval(node.operand)
+            if isinstance(node.op, ast.Invert):
+                return np.logical_not(operand)
+            return np.negative(operand) if isinstance(node.op, ast.USub) else operand
+        if isinstance(node, ast.BinOp):
+            return self.binary(node.op, self.eval(node.left), self.eval(node.right))
+        if isinstance(node, ast.Compare):
+            left, right = self.eval(node.left), self.eval(node.comparators[0])
+            return _COMPARE_OPS[type(node.ops[0])](left, right)
+        return self.call(node.func.id, [self.eval(arg) for arg in node.args])
+
+    def binary(self, op, left, right):
+        if right is _DAY_UNIT or left is _DAY_UNIT:
+            # 天数：把整数或小数转换为按天计的时间差，小数四舍五入到整天
+            count = left if right is _DAY_UNIT else right
+            return np.rint(np.asarray(count, dtype=float)).astype("timedelta64[D]")
+        if _is_temporal(left) or _is_temporal(right):
+            left, right = _as_dates(left), _as_dates(right)
+        elif isinstance(op, ast.Sub) and _is_text(left) and _is_text(right):
+            left, right = _as_dates(left), _as_dates(right)
+        values = _BINARY_OPS[type(op)](left, right)
+        if _is_days(values) and not (_is_days(left) or _is_days(right)):
+            return values.astype(np.int64)  # 两个日期相减得到相差的天数
+        return values
+
+    def call(self, name, args):
+        size = self.num_rows
+        if name == "randint":
+            return self.rng.integers(args[0], args[1], size=size, endpoint=True)
+        if name == "uniform":
+            return self.rng.uniform(args[0], args[1], size=size)
+        if name == "normal":
+            return self.rng.normal(args[0], args[1], size=size)
+        if name == "round":
+            return np.round(args[0], int(args[1]) if len(args) > 1 else 0)
+        if name == "abs":
+            return np.abs(args[0])
+        if name == "min":
+            return np.minimum(args[0], args[1])
+        if name == "max":
+            return np.maximum(args[0], args[1])
+        return np.where(args[0], args[1], args[2])
+
+
+# 对 num_rows 行求公式列的值；columns 为已生成的列（列名 -> 数组或 Series），随机函数使用该列自己的随机流
+# 日期结果与日期列一样输出为 ISO 格式的字符串
+def evaluate_expression(spec, columns, num_rows, rng):
+    expression = compile_expression(_expression_text(spec))
+    values = _Evaluator(expression, columns, num_rows, rng).eval(expression.tree)
+    if values is _DAY_UNIT:
+        raise ValueError(f"公式 {expression.text} 中的 days 前缺少天数")
+    values = np.asarray(values)
+    if values.ndim == 0:
+        values = np.full(num_rows, values.item(), dtype=object if values.dtype.kind in "OU" else values.dtype)
+    if values.dtype.kind == "M":
+        text = np.datetime_as_string(values.astype("datetime64[D]"), unit="D").astype(object)
+        text[np.isnat(values)] = None
+        return text
+    if values.dtype.kind == "U":
+        return values.astype(object)
+    return values
+
+
+# 公式结果对应的数据类型（整数、小数、日期），用于写入数据库时建表；无法确定时返回 None
+def expression_type(spec, specs):
+    by_name = {s["name"]: s for s in specs}
+    expression = compile_expression(_expression_text(spec))
+
+    def infer(node):
+        if isinstance(node, ast.Expression):
+            return infer(node.body)
+        if isinstance(node, ast.Constant):
+            return {int: "整数", float: "小数"}.get(type(node.value))
+        if isinstance(node, ast.Name):
+            if node.id == _DAYS:
+                return "天数"
+            column = by_name.get(expression.names[node.id])
+            if column is None:
+                return None
+            if column["type"] == FORMULA:
+                return expression_type(column, specs)
+            return {"自增ID": "整数", "随机ID": "整数"}.get(column["type"], column["type"])
+        if isinstance(node, ast.UnaryOp):
+            return infer(node.operand) if not isinstance(node.op, ast.Invert) else None
+        if isinstance(node, ast.Compare):
+            return None
+        if isinstance(node, ast.BinOp):
+            left, right = infer(node.left), infer(node.right)
+            if "天数" in (left, right) and isinstance(node.op, ast.Mult):
+                return "天数"
+            if "日期" in (left, right):
+                if left == right == "日期" and isinstance(node.op, ast.Sub):
+                    return "整数"
+                return "日期"
+            if isinstance(node.op, ast.Div):
+                return "小数"
+            return _numeric_type(left, right)
+        name = node.func.id
+        args = [infer(arg) for arg in node.args]
+        if name == "randint":
+            return "整数"
+        if name in ("uniform", "normal"):
+            return "小数"
+        if name == "where":
+            return args[1] if args[1] == args[2] else _numeric_type(args[1], args[2])
+        return args[0] if len(args) == 1 or name == "round" else _numeric_type(*args)
+
+    return infer(expression.tree)
+
+
+def _numeric_type(left, right):
+    if left in ("整数", "小数") and right in ("整数", "小数"):
+        return "小数" if "小数" in (left, right) else "整数"
+    return None
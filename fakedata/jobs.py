@@ -0,0 +1,164 @@
+# 后台任务：生成、导出和写入数据库都在有界线程池中运行，页面只轮询任务进度，不会因为一次大数据量的操作而卡住
+# 每个用户同时运行的任务数和排队的任务总数都有上限；任务在分块之间检查取消标志，可以在运行过程中取消
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# 后台线程数、每个用户同时运行的任务数和全局排队上限，可通过环境变量调整
+DEFAULT_JOB_WORKERS = int(os.environ.get("FAKEDATA_JOB_WORKERS", "2"))
+DEFAULT_JOBS_PER_USER = int(os.environ.get("FAKEDATA_JOBS_PER_USER", "1"))
+DEFAULT_JOB_QUEUE = int(os.environ.get("FAKEDATA_JOB_QUEUE", "8"))
+
+# 保留的已结束任务数，超过后删除最早结束的任务
+_FINISHED_JOBS = 100
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+# 任务状态的显示名称
+STATUS_LABELS = {
+    QUEUED: "排队中",
+    RUNNING: "进行中",
+    DONE: "已完成",
+    FAILED: "失败",
+    CANCELLED: "已取消",
+}
+
+
+# 任务在分块之间发现取消标志时抛出
+class JobCancelled(Exception):
+    pass
+
+
+# 一个后台任务：记录进度、结果和错误；进度由运行任务的线程更新，页面线程只读取
+class Job:
+    def __init__(self, owner, total_rows, label=""):
+        self.id = uuid.uuid4().hex
+        self.owner = owner
+        self.label = label
+        self.total_rows = total_rows
+        self.rows_done = 0
+        self.status = QUEUED
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._cancel = threading.Event()
+
+    @property
+    def active(self):
+        return self.status in (QUEUED, RUNNING)
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    # 在分块之间调用：已请求取消时抛出 JobCancelled
+    def check(self):
+        if self._cancel.is_set():
+            raise JobCancelled(f"任务 {self.id} 已取消")
+
+    def advance(self, rows):
+        self.rows_done += rows
+
+    # 逐块转发分块并记录进度，每块之前检查是否已取消
+    def track(self, chunks):
+        for chunk in chunks:
+            self.check()
+            yield chunk
+            self.advance(len(chunk))
+
+    @property
+    def progress(self):
+        return min(self.rows_done / self.total_rows, 1.0) if self.total_rows else 0.0
+
+    @property
+    def elapsed(self):
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    @property
+    def rows_per_second(self):
+        return self.rows_done / self.elapsed if self.elapsed > 0 else 0.0
+
+
+# 进程内共享的任务管理器：有界线程池加每个用户的并发上限
+class JobManager:
+    def __init__(self, max_workers=DEFAULT_JOB_WORKERS, per_user=DEFAULT_JOBS_PER_USER, max_queue=DEFAULT_JOB_QUEUE):
+        self.per_user = per_user
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fakedata-job")
+        self._jobs = OrderedDict()  # 任务 ID -> Job
+        self._lock = threading.Lock()
+
+    # 提交任务：run(job) 在后台线程中执行，返回值作为任务结果；超过并发或排队上限时抛出 RuntimeError
+    def submit(self, owner, total_rows, run, label=""):
+        with self._lock:
+            active = [job for job in self._jobs.values() if job.active]
+            if sum(job.owner == owner for job in active) >= self.per_user:
+                raise RuntimeError(f"每个用户最多同时运行 {self.per_user} 个后台任务，请等待当前任务完成或取消")
+            if len(active) >= self.max_queue:
+                raise RuntimeError("当前排队的后台任务过多，请稍后再试")
+            job = Job(owner, total_rows, label)
+            self._jobs[job.id] = job
+            self._prune()
+        self._executor.submit(self._run, job, run)
+        return job
+
+    def _run(self, job, run):
+        job.started_at = time.time()
+        job.status = RUNNING
+        try:
+            job.check()  # 排队期间已被取消
+            job.result = run(job)
+            job.rows_done = job.total_rows
+            job.status = DONE
+        except JobCancelled:
+            job.status = CANCELLED
+        except Exception as e:
+            job.error = e
+            job.status = FAILED
+        finally:
+            job.finished_at = time.time()
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if not job.active]
+        for job_id in finished[: max(len(finished) - _FINISHED_JOBS, 0)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    # 某个用户的任务，按提交顺序排列
+    def jobs(self, owner=None):
+        with self._lock:
+            return [job for job in self._jobs.values() if owner is None or job.owner == owner]
+
+    def cancel(self, job_id):
+        job = self.get(job_id)
+        if job is not None:
+            job.cancel()
+        return job
+
+    # 结果交给页面后删除任务，释放对结果的引用
+    def discard(self, job_id):
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+    def shutdown(self, cancel=True):
+        if cancel:
+            for job in self.jobs():
+                job.cancel()
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,140 @@
+# 生成过程的性能分析：按阶段和列记录耗时、生成的值数量和结果占用的内存
+# 结果可以显示在界面中，也可以输出为结构化日志或 Prometheus 文本格式的计数器
+import json
+import logging
+import time
+from contextlib import contextmanager
+
+# 各阶段的显示名称
+PHASE_LABELS = {
+    "pools": "数据池构建",
+    "cells": "单元格生成",
+    "frame": "DataFrame 构建",
+    "export": "导出",
+    "spill": "写入磁盘",
+}
+
+logger = logging.getLogger("fakedata.metrics")
+
+
+# 估算一列数据占用的内存字节数（包括对象列中字符串本身）
+def memory_of(values):
+    import pandas as pd
+
+    return int(pd.Series(values, copy=False).memory_usage(index=False, deep=True))
+
+
+class Profiler:
+    def __init__(self):
+        self._records = {}  # (阶段, 列名) -> 累计指标，按首次出现的顺序保存
+
+    def add(self, phase, column="", seconds=0.0, values=0, nbytes=0, calls=1):
+        record = self._records.setdefault((phase, column), {"seconds": 0.0, "values": 0, "bytes": 0, "calls": 0})
+        record["seconds"] += seconds
+        record["values"] += values
+        record["bytes"] += nbytes
+        record["calls"] += calls
+
+    # 计时上下文；可在 with 块中设置 entry["bytes"] 记录结果占用的内存
+    @contextmanager
+    def measure(self, phase, column="", values=0):
+        entry = {"bytes": 0}
+        started = time.perf_counter()
+        try:
+            yield entry
+        finally:
+            self.add(phase, column, time.perf_counter() - started, values, entry["bytes"])
+
+    # 合并其他进程返回的记录（见 records）
+    def merge(self, records):
+        for record in records:
+            self.add(record["phase"], record["column"], record["seconds"], record["values"], record["bytes"], record["calls"])
+
+    def records(self):
+        rows = []
+        for (phase, column), record in self._records.items():
+            rows.append({
+                "phase": phase,
+                "column": column,
+                **record,
+                "us_per_value": record["seconds"] / record["values"] * 1e6 if record["values"] else None,
+            })
+        return rows
+
+    # 供界面显示的表格数据
+    def table(self):
+        return [
+            {
+                "阶段": PHASE_LABELS.get(row["phase"], row["phase"]),
+                "列名": row["column"],
+                "耗时(秒)": round(row["seconds"], 4),
+                "值数量": row["values"],
+                "每个值耗时(微秒)": None if row["us_per_value"] is None else round(row["us_per_value"], 3),
+                "内存(MB)": round(row["bytes"] / 1024 / 1024, 2),
+            }
+            for row in self.records()
+        ]
+
+    # 每条记录输出一行 JSON 日志
+    def log(self, log=logger, **context):
+        for row in self.records():
+            log.info(json.dumps({"event": "fakedata.metrics", **context, **row}, ensure_ascii=False))
+
+    # Prometheus 文本格式，可写入 node_exporter 的 textfile 目录
+    def to_prometheus(self, prefix="fakedata"):
+        metrics = [
+            ("seconds", "seconds_total", "各阶段累计耗时（秒）"),
+            ("values", "values_total", "各阶段生成或写出的值数量"),
+            ("bytes", "bytes_total", "生成结果占用的内存字节数"),
+        ]
+        lines = []
+        for field, suffix, help_text in metrics:
+            name = f"{prefix}_{suffix}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for row in self.records():
+                column = row["column"].replace("\\", "\\\\").replace('"', '\\"')
+                lines.append(f'{name}{{phase="{row["phase"]}",column="{column}"}} {row[field]}')
+        return "\n".join(lines) + "\n"
+
+
+# 不记录任何内容的分析器，未开启性能分析时使用
+class NullProfiler:
+    def add(self, phase, column="", seconds=0.0, values=0, nbytes=0, calls=1):
+        pass
+
+    @contextmanager
+    def measure(self, phase, column="", values=0):
+        yield None
+
+    def merge(self, records):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
+
+
+# 写出分块数据并记录导出耗时：扣除等待下一个分块（即生成数据）的时间，只统计写出本身
+# 返回 write 的返回值；phase 为记录的阶段名
+def profiled_write(profiler, chunks, write, phase="export"):
+    waiting = 0.0
+    total_rows = 0
+
+    def timed_chunks():
+        nonlocal waiting, total_rows
+        iterator = iter(chunks)
+        while True:
+            started = time.perf_counter()
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                waiting += time.perf_counter() - started
+            total_rows += len(chunk)
+            yield chunk
+
+    started = time.perf_counter()
+    result = write(timed_chunks())
+    profiler.add(phase, "", time.perf_counter() - started - waiting, total_rows)
+    return result
@@ -0,0 +1,54 @@
+# 多进程并行生成：分块在 ProcessPoolExecutor 中生成，按顺序产出
+# 随机流按全局行块由主种子派生，因此输出与进程数和 chunk_rows 都无关，和 generate_chunks 完全一致
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from fakedata.engine import build_chunk, chunk_offsets, chunk_sizes, prepare_pools, resolve_seed
+from fakedata.metrics import NULL_PROFILER, Profiler
+
+# 子进程内的共享状态：列配置、主种子和父进程构建好的独特数据池
+_worker_state = {}
+
+
+def _init_worker(specs, seed, pools):
+    _worker_state["specs"] = specs
+    _worker_state["seed"] = seed
+    _worker_state["pools"] = pools
+
+
+# 生成一个分块；开启性能分析时连同子进程中的记录一起返回
+def _generate_chunk(num_rows, offset, total_rows, profile):
+    profiler = Profiler() if profile else NULL_PROFILER
+    chunk = build_chunk(
+        _worker_state["specs"], num_rows, _worker_state["seed"], _worker_state["pools"], profiler, offset, total_rows
+    )
+    return chunk, profiler.records() if profile else None
+
+
+# 并行分块生成；同时在途的分块数受限，以保持内存占用稳定
+# 子进程中的耗时记录会合并到传入的 profiler 中（各列耗时为所有进程的累计值）
+def generate_parallel(specs, num_rows, chunk_rows=100_000, seed=None, workers=None, locale="zh_CN", profiler=NULL_PROFILER):
+    sizes = chunk_sizes(num_rows, chunk_rows)
+    seed = resolve_seed(seed)
+    pools = prepare_pools(specs, seed, locale, profiler)  # 独特数据池只在父进程构建一次
+    profile = profiler is not NULL_PROFILER
+    workers = workers or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(specs, seed, pools))
+    try:
+        pending = deque()
+        for rows, offset in zip(sizes, chunk_offsets(sizes)):
+            pending.append(executor.submit(_generate_chunk, rows, offset, num_rows, profile))
+            if len(pending) >= workers * 2:
+                yield _collect(pending.popleft(), profiler)
+        while pending:
+            yield _collect(pending.popleft(), profiler)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _collect(future, profiler):
+    chunk, records = future.result()
+    if records:
+        profiler.merge(records)
+    return chunk
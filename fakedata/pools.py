@@ -0,0 +1,125 @@
+# 持久化的 Faker 数据池：按 (数据提供者, 语言区域) 预先生成大量独特值并保存到磁盘
+# 数据池以定长 Unicode 数组保存为 .npy 文件，首次使用时以内存映射方式加载，之后每次生成只需抽样
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+
+# 数据池所在目录，可通过环境变量 FAKEDATA_POOL_DIR 调整
+DEFAULT_POOL_DIR = os.environ.get("FAKEDATA_POOL_DIR", str(Path.home() / ".cache" / "fakedata" / "pools"))
+
+# 首次按需构建时的数据池大小；更大的数据池可通过 fakedata pools build 预先生成
+DEFAULT_POOL_SIZE = 10_000
+
+# 界面中可选的语言区域
+LOCALES = ["zh_CN", "en_US", "ja_JP"]
+
+# 构建数据池时使用的固定种子，保证不同机器上构建出的数据池一致
+_BUILD_SEED = 0
+
+# 抽样方式的版本号，计入数据集缓存键；修改 precompute_values 或 sample 的结果时需要加一
+POOL_VERSION = 2
+
+
+# 用 Faker 生成最多 size 个互不相同的值，保持首次出现的顺序
+# 当一批调用几乎不再产生新值时提前停止（例如国家名称只有两百多个）
+def precompute_values(provider, locale, size, seed=_BUILD_SEED):
+    from faker import Faker
+
+    fake = Faker(locale)
+    fake.seed_instance(seed)
+    make_value = getattr(fake, provider)
+    values = {}
+    while len(values) < size:
+        before = len(values)
+        batch = min(10_000, max(100, 2 * (size - len(values))))
+        for _ in range(batch):
+            values.setdefault(make_value(), None)
+        if len(values) - before < batch // 20:
+            break
+    return list(values)[:size]
+
+
+class PoolStore:
+    def __init__(self, root=None):
+        self.root = Path(root or DEFAULT_POOL_DIR)
+        self._pools = {}  # (provider, locale) -> 内存映射的数组
+        self._exhausted = set()  # 已无法生成更多独特值的数据池
+        self._lock = threading.Lock()
+
+    def path(self, provider, locale):
+        return self.root / locale / f"{provider}.npy"
+
+    # 标记文件：存在时表示磁盘上的数据池已包含 Faker 能生成的全部独特值，新进程不必再次构建
+    def exhausted_path(self, provider, locale):
+        return self.root / locale / f"{provider}.exhausted"
+
+    # 构建数据池并保存到磁盘；目录不可写时只保留在内存中
+    def build(self, provider, locale, size=DEFAULT_POOL_SIZE):
+        pool = np.array(precompute_values(provider, locale, size), dtype=str)
+        path = self.path(provider, locale)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npy")
+            np.save(tmp_path, pool)
+            os.replace(tmp_path, path)  # 原子替换，避免并发读取到写了一半的文件
+            pool = np.load(path, mmap_mode="r")
+            if len(pool) < size:
+                self.exhausted_path(provider, locale).touch()
+            else:
+                self.exhausted_path(provider, locale).unlink(missing_ok=True)
+        except OSError:
+            pass
+        with self._lock:
+            self._pools[(provider, locale)] = pool
+            if len(pool) < size:
+                self._exhausted.add((provider, locale))
+        return pool
+
+    # 懒加载数据池；磁盘上没有或数据池小于 min_size 时先构建
+    def load(self, provider, locale, min_size=0):
+        with self._lock:
+            pool = self._pools.get((provider, locale))
+        if pool is None:
+            path = self.path(provider, locale)
+            if path.exists():
+                pool = np.load(path, mmap_mode="r")
+                with self._lock:
+                    self._pools[(provider, locale)] = pool
+                    if self.exhausted_path(provider, locale).exists():
+                        self._exhausted.add((provider, locale))
+        if pool is None or (len(pool) < min_size and (provider, locale) not in self._exhausted):
+            pool = self.build(provider, locale, max(min_size, DEFAULT_POOL_SIZE))
+        return pool
+
+    # 从数据池中抽取 count 个值；不放回抽样时最多返回整个数据池
+    # 抽样范围是数据池的前 max(count, DEFAULT_POOL_SIZE) 个值，与磁盘上数据池当前的大小无关：
+    # 用固定种子构建的数据池互为前缀，数据池被更大的 count 或 pools build 重建后，同样的种子仍抽到同样的值
+    def sample(self, provider, locale, count, rng, replace=False):
+        domain = max(count, DEFAULT_POOL_SIZE)
+        pool = self.load(provider, locale, min_size=domain)[:domain]
+        if not replace:
+            count = min(count, len(pool))
+        index = rng.choice(len(pool), size=count, replace=replace)
+        return pool[index].astype(object)
+
+    # 列出磁盘上已有的数据池：(语言区域, 数据提供者, 值的数量)
+    def available(self):
+        pools = []
+        for path in sorted(self.root.glob("*/*.npy")):
+            if ".tmp" in path.name:
+                continue
+            pools.append((path.parent.name, path.stem, len(np.load(path, mmap_mode="r"))))
+        return pools
+
+
+_default_store = None
+
+
+# 进程内共享的默认数据池存储
+def get_pool_store():
+    global _default_store
+    if _default_store is None:
+        _default_store = PoolStore()
+    return _default_store
@@ -0,0 +1,217 @@
+# 各行业预设的列配置（模式注册表），键为行业名称
+
+# 所有支持的数据类型
+COLUMN_TYPES = [
+    "列名", "枚举", "日期", "姓名", "公司", "城市", "国家", "整数", "小数", "UUID",
+    "自增ID", "随机ID", "UUIDv7", "ULID", "编码", "公式",
+]
+
+# 整数、小数列可选的分布及其显示名称
+DISTRIBUTIONS = {
+    "uniform": "均匀分布",
+    "normal": "正态分布",
+    "lognormal": "对数正态分布",
+    "zipf": "Zipf 分布",
+    "poisson": "泊松分布",
+}
+
+# 随机ID 的默认取值范围上限：12 位十进制数，在 Excel 和 JavaScript 中都能精确表示
+RANDOM_ID_MAX = 999_999_999_999
+
+default_columns = {
+    "默认": [
+        {"name": "ID", "type": "UUID"},
+        {"name": "姓名", "type": "姓名", "unique_count": 5},
+        {"name": "城市", "type": "城市", "unique_count": 5},
+        {"name": "注册日期", "type": "日期"},
+        {"name": "金额", "type": "小数", "min": 100.0, "max": 10000.0},
+    ],
+    "汽车": [
+        {"name": "车辆ID", "type": "UUID"},
+        {"name": "品牌", "type": "枚举", "custom_values": "宝马, 奔驰, 特斯拉"},
+        {"name": "车型", "type": "枚举", "custom_values": "轿车, SUV, 跑车"},
+        {"name": "生产日期", "type": "日期"},
+        {"name": "价格", "type": "小数", "min": 10000.0, "max": 100000.0},
+        {"name": "车主姓名", "type": "姓名", "unique_count": 5},
+        {"name": "车主城市", "type": "城市", "unique_count": 5},
+        {"name": "购买日期", "type": "日期"},
+        {"name": "保修期（月）", "type": "整数", "min": 12, "max": 60},
+    ],
+    "银行": [
+        {"name": "账户ID", "type": "UUID"},
+        {"name": "客户姓名", "type": "姓名", "unique_count": 5},
+        {"name": "账户类型", "type": "枚举", "custom_values": "储蓄账户, 信用卡账户"},
+        {"name": "余额", "type": "小数", "min": 0.0, "max": 100000.0},
+        {"name": "开户日期", "type": "日期"},
+        {"name": "最近交易日期", "type": "日期"},
+        {"name": "信用评分", "type": "整数", "min": 300, "max": 850},
+        {"name": "贷款金额", "type": "小数", "min": 0.0, "max": 500000.0},
+        {"name": "贷款状态", "type": "枚举", "custom_values": "已结清, 未结清, 逾期"},
+    ],
+    "医药": [
+        {"name": "药品ID", "type": "UUID"},
+        {"name": "药品名称", "type": "枚举", "custom_values": "阿司匹林, 维生素C, 抗生素"},
+        {"name": "生产厂家", "type": "公司", "unique_count": 5},
+        {"name": "生产日期", "type": "日期"},
+        {"name": "有效期（月）", "type": "整数", "min": 1, "max": 36},
+        {"name": "库存数量", "type": "整数", "min": 0, "max": 1000},
+        {"name": "单价", "type": "小数", "min": 10.0, "max": 500.0},
+        {"name": "销售数量", "type": "整数", "min": 0, "max": 100},
+        {"name": "销售日期", "type": "日期"},
+    ],
+    "电商": [
+        {"name": "订单ID", "type": "UUID"},
+        {"name": "用户ID", "type": "UUID"},
+        {"name": "商品名称", "type": "枚举", "custom_values": "手机, 电脑, 服装"},
+        {"name": "商品类别", "type": "枚举", "custom_values": "电子产品, 家居用品, 食品"},
+        {"name": "购买数量", "type": "整数", "min": 1, "max": 10},
+        {"name": "单价", "type": "小数", "min": 50.0, "max": 1000.0},
+        {"name": "总金额", "type": "公式", "expression": "round(购买数量 * 单价, 2)"},
+        {"name": "下单时间", "type": "日期"},
+        {"name": "支付状态", "type": "枚举", "custom_values": "已支付:0.9, 未支付:0.1"},
+        {"name": "物流状态", "type": "枚举", "custom_values": "已发货, 运输中, 已签收"},
+    ],
+    "教育": [
+        {"name": "学生ID", "type": "UUID"},
+        {"name": "姓名", "type": "姓名", "unique_count": 5},
+        {"name": "年龄", "type": "整数", "min": 5, "max": 25},
+        {"name": "性别", "type": "枚举", "custom_values": "男, 女"},
+        {"name": "班级", "type": "枚举", "custom_values": "一年级, 二年级, 三年级"},
+        {"name": "成绩", "type": "小数", "min": 0.0, "max": 100.0},
+        {"name": "入学日期", "type": "日期"},
+        {"name": "家庭住址", "type": "城市", "unique_count": 5},
+        {"name": "联系电话", "type": "列名", "unique_count": 5},
+    ],
+    "医疗健康": [
+        {"name": "患者ID", "type": "UUID"},
+        {"name": "姓名", "type": "姓名", "unique_count": 5},
+        {"name": "性别", "type": "枚举", "custom_values": "男, 女"},
+        {"name": "年龄", "type": "整数", "min": 1, "max": 100},
+        {"name": "病历号", "type": "UUID"},
+        {"name": "就诊日期", "type": "日期"},
+        {"name": "疾病类型", "type": "枚举", "custom_values": "感冒, 高血压, 糖尿病"},
+        {"name": "医生姓名", "type": "姓名", "unique_count": 5},
+        {"name": "诊断结果", "type": "枚举", "custom_values": "确诊, 疑似, 未确诊"},
+        {"name": "药品名称", "type": "枚举", "custom_values": "阿司匹林, 维生素C"},
+    ],
+    "物流与运输": [
+        {"name": "运单ID", "type": "UUID"},
+        {"name": "发货人姓名", "type": "姓名", "unique_count": 5},
+        {"name": "收货人姓名", "type": "姓名", "unique_count": 5},
+        {"name": "发货地址", "type": "城市", "unique_count": 5},
+        {"name": "收货地址", "type": "城市", "unique_count": 5},
+        {"name": "物品名称", "type": "枚举", "custom_values": "电子产品, 食品, 家具"},
+        {"name": "物品重量", "type": "小数", "min": 0.1, "max": 100.0},
+        {"name": "运输方式", "type": "枚举", "custom_values": "空运, 陆运, 海运"},
+        {"name": "发货日期", "type": "日期"},
+        {"name": "预计到达日期", "type": "公式", "expression": "发货日期 + randint(1, 7) days"},
+        {"name": "物流状态", "type": "枚举", "custom_values": "已发货, 运输中, 已签收"},
+    ],
+    "房地产": [
+        {"name": "房产ID", "type": "UUID"},
+        {"name": "房产类型", "type": "枚举", "custom_values": "公寓, 别墅, 商铺"},
+        {"name": "地址", "type": "城市", "unique_count": 5},
+        {"name": "面积", "type": "小数", "min": 50.0, "max": 500.0},
+        {"name": "房间数量", "type": "整数", "min": 1, "max": 10},
+        {"name": "价格", "type": "小数", "min": 500000.0, "max": 10000000.0},
+        {"name": "是否出售", "type": "枚举", "custom_values": "是, 否"},
+        {"name": "上市日期", "type": "日期"},
+        {"name": "房主姓名", "type": "姓名", "unique_count": 5},
+        {"name": "联系电话", "type": "列名", "unique_count": 5},
+    ],
+    "旅游与酒店": [
+        {"name": "订单ID", "type": "UUID"},
+        {"name": "客户姓名", "type": "姓名", "unique_count": 5},
+        {"name": "出行日期", "type": "日期"},
+        {"name": "返回日期", "type": "公式", "expression": "出行日期 + randint(1, 14) days"},
+        {"name": "目的地", "type": "城市", "unique_count": 5},
+        {"name": "酒店名称", "type": "枚举", "custom_values": "希尔顿, 万豪, 如家"},
+        {"name": "房型", "type": "枚举", "custom_values": "标准间, 豪华间, 套房"},
+        {"name": "价格", "type": "小数", "min": 500.0, "max": 5000.0},
+        {"name": "预订状态", "type": "枚举", "custom_values": "已确认, 待确认, 已取消"},
+    ],
+    "保险行业": [
+        {"name": "保单ID", "type": "UUID"},
+        {"name": "客户姓名", "type": "姓名", "unique_count": 5},
+        {"name": "年龄", "type": "整数", "min": 18, "max": 80},
+        {"name": "性别", "type": "枚举", "custom_values": "男, 女"},
+        {"name": "保险类型", "type": "枚举", "custom_values": "人寿保险, 车险, 健康险"},
+        {"name": "保额", "type": "小数", "min": 100000.0, "max": 10000000.0},
+        {"name": "保费", "type": "小数", "min": 1000.0, "max": 50000.0},
+        {"name": "投保日期", "type": "日期"},
+        {"name": "到期日期", "type": "日期"},
+        {"name": "理赔状态", "type": "枚举", "custom_values": "已理赔, 未理赔"},
+    ],
+    "社交媒体": [
+        {"name": "用户ID", "type": "UUID"},
+        {"name": "用户名", "type": "姓名", "unique_count": 5},
+        {"name": "注册日期", "type": "日期"},
+        {"name": "性别", "type": "枚举", "custom_values": "男, 女"},
+        {"name": "年龄", "type": "整数", "min": 13, "max": 80},
+        {"name": "关注人数", "type": "整数", "min": 0, "max": 10000},
+        {"name": "粉丝数量", "type": "整数", "min": 0, "max": 1000000},
+        {"name": "发帖数量", "type": "整数", "min": 0, "max": 10000},
+        {"name": "最近登录时间", "type": "日期"},
+        {"name": "所在城市", "type": "城市", "unique_count": 5},
+    ],
+    "游戏行业": [
+        {"name": "玩家ID", "type": "UUID"},
+        {"name": "玩家昵称", "type": "姓名", "unique_count": 5},
+        {"name": "注册日期", "type": "日期"},
+        {"name": "游戏名称", "type": "枚举", "custom_values": "王者荣耀, 原神, 英雄联盟"},
+        {"name": "角色等级", "type": "整数", "min": 1, "max": 100},
+        {"name": "在线时长", "type": "小数", "min": 0.0, "max": 1000.0},
+        {"name": "充值金额", "type": "小数", "min": 0.0, "max": 10000.0, "distribution": "lognormal"},
+        {"name": "最近登录时间", "type": "日期"},
+        {"name": "所在地区", "type": "城市", "unique_count": 5},
+    ],
+    "金融投资": [
+        {"name": "投资者ID", "type": "UUID"},
+        {"name": "姓名", "type": "姓名", "unique_count": 5},
+        {"name": "投资产品", "type": "枚举", "custom_values": "股票, 基金, 债券"},
+        {"name": "投资金额", "type": "小数", "min": 1000.0, "max": 1000000.0},
+        {"name": "投资日期", "type": "日期"},
+        {"name": "当前价值", "type": "小数", "min": 1000.0, "max": 10000000.0},
+        {"name": "收益率", "type": "小数", "min": -1.0, "max": 1.0},
+        {"name": "风险等级", "type": "枚举", "custom_values": "低风险, 中风险, 高风险"},
+        {"name": "投资状态", "type": "枚举", "custom_values": "持有中, 已赎回"},
+    ],
+    "农业": [
+        {"name": "农场ID", "type": "UUID"},
+        {"name": "农场名称", "type": "公司", "unique_count": 5},
+        {"name": "农产品类型", "type": "枚举", "custom_values": "小麦, 玉米, 水果"},
+        {"name": "种植面积", "type": "小数", "min": 10.0, "max": 1000.0},
+        {"name": "产量", "type": "小数", "min": 100.0, "max": 10000.0},
+        {"name": "销售价格", "type": "小数", "min": 10.0, "max": 500.0},
+        {"name": "收获日期", "type": "日期"},
+        {"name": "农场地址", "type": "城市", "unique_count": 5},
+    ],
+    "娱乐与影视": [
+        {"name": "电影ID", "type": "UUID"},
+        {"name": "电影名称", "type": "枚举", "custom_values": "复仇者联盟, 泰坦尼克号"},
+        {"name": "导演姓名", "type": "姓名", "unique_count": 5},
+        {"name": "上映日期", "type": "日期"},
+        {"name": "类型", "type": "枚举", "custom_values": "动作, 喜剧, 科幻"},
+        {"name": "票房收入", "type": "小数", "min": 100000.0, "max": 100000000.0, "distribution": "lognormal"},
+        {"name": "观影人数", "type": "整数", "min": 1000, "max": 1000000},
+        {"name": "评分", "type": "小数", "min": 0.0, "max": 10.0},
+    ],
+}
+
+# 多表关联预设：子表中 type 为“外键”的列引用父表的主键（references 格式为“表名.列名”）
+# 带 fanout 的子表按扇出分布为每个父行生成若干子行（一对多），其余外键列随机引用父行（多对一）
+relational_presets = {
+    "社交电商": {
+        "tables": [
+            {"name": "用户", "rows": 10000, "columns": default_columns["社交媒体"]},
+            {
+                "name": "订单",
+                "columns": [
+                    {"name": "用户ID", "type": "外键", "references": "用户.用户ID"} if column["name"] == "用户ID" else column
+                    for column in default_columns["电商"]
+                ],
+                "fanout": {"column": "用户ID", "distribution": "poisson", "mean": 5, "max": 100},
+            },
+        ],
+    },
+}
@@ -0,0 +1,299 @@
+# 多表关联生成：列可以引用其他表的主键（外键），生成的各表之间可以正确 JOIN
+# 父表分块生成时把被引用的主键收集到紧凑的 NumPy 索引中（UUID 每个 16 字节），子表按下标从索引中取值，
+# 不需要扫描或保留父表的 DataFrame；父表和子表都按分块流式生成
+import copy
+
+import numpy as np
+import pandas as pd
+
+from fakedata.engine import (
+    RNG_BLOCK_ROWS,
+    chunk_sizes,
+    column_rng,
+    format_uuids,
+    generate_column,
+    parse_uuids,
+    prepare_pools,
+    resolve_seed,
+)
+from fakedata.expressions import evaluation_order
+from fakedata.metrics import NULL_PROFILER, memory_of
+from fakedata.presets import relational_presets
+from fakedata.schema import fill_defaults, read_schema_file
+
+# 外键列的数据类型
+FOREIGN_KEY = "外键"
+
+# 各表、扇出分布使用的独立随机流编号，不会与行块序号和数据池随机流冲突
+_TABLE_STREAM = 2**32 + 1
+_FANOUT_STREAM = 2**32 + 2
+
+# 一对多时每次抽取扇出的父行数；固定大小，子表外键的分布与 chunk_rows 无关
+_FANOUT_BLOCK = 8192
+
+
+# 以 UUID 字符串和 int64 形式压缩保存的主键类型
+_UUID_KEYS = ("UUID", "UUIDv7")
+_INTEGER_KEYS = ("整数", "自增ID", "随机ID")
+
+
+# 父表主键的紧凑索引：UUID 保存为 (n, 16) 的字节数组，整数保存为 int64，其余保存为定长字符串
+class KeyIndex:
+    def __init__(self, key_type):
+        self.key_type = key_type
+        self._parts = []
+        self.keys = None
+
+    def append(self, values):
+        if self.key_type in _UUID_KEYS:
+            self._parts.append(parse_uuids(values))
+        elif self.key_type in _INTEGER_KEYS:
+            self._parts.append(np.asarray(values, dtype=np.int64))
+        else:
+            self._parts.append(np.asarray(values).astype(str))
+
+    # 父表生成完毕后合并为一个数组
+    def freeze(self):
+        if not self._parts:
+            self.append(np.empty(0, dtype=object))
+        self.keys = np.concatenate(self._parts)
+        self._parts = []
+
+    def __len__(self):
+        return 0 if self.keys is None else len(self.keys)
+
+    # 按父行下标批量取出主键值
+    def take(self, positions):
+        keys = self.keys[positions]
+        if self.key_type in _UUID_KEYS:
+            return format_uuids(keys).astype(object)
+        if self.key_type in _INTEGER_KEYS:
+            return keys
+        return keys.astype(object)
+
+
+def _split_reference(reference):
+    table, sep, column = str(reference).partition(".")
+    if not sep or not table or not column:
+        raise ValueError(f"外键引用格式应为“表名.列名”: {reference}")
+    return table, column
+
+
+# 校验多表配置，补全列的默认值，并按引用关系排序（父表在前）
+def plan_tables(tables):
+    if isinstance(tables, dict):
+        tables = tables.get("tables", [])
+    if not tables:
+        raise ValueError("多表配置中没有表")
+    by_name = {}
+    for table in tables:
+        if "name" not in table or not table.get("columns"):
+            raise ValueError(f"表配置缺少 name 或 columns: {table.get('name')}")
+        if table["name"] in by_name:
+            raise ValueError(f"表名重复: {table['name']}")
+        by_name[table["name"]] = table
+
+    planned = {}
+    for table in tables:
+        columns = []
+        for column in table["columns"]:
+            if column.get("type") == FOREIGN_KEY:
+                parent, key = _split_reference(column.get("references"))
+                if parent not in by_name:
+                    raise ValueError(f"外键 {table['name']}.{column.get('name')} 引用了不存在的表: {parent}")
+                if key not in [c.get("name") for c in by_name[parent]["columns"]]:
+                    raise ValueError(f"外键 {table['name']}.{column.get('name')} 引用了不存在的列: {parent}.{key}")
+                columns.append({**column, "parent": parent, "key": key})
+            else:
+                columns.append(fill_defaults([column])[0])
+        fanout = table.get("fanout")
+        if fanout is not None:
+            fk_names = [c["name"] for c in columns if c["type"] == FOREIGN_KEY]
+            if fanout.get("column") not in fk_names:
+                raise ValueError(f"表 {table['name']} 的 fanout.column 必须是该表的外键列")
+        elif table.get("rows") is None:
+            raise ValueError(f"表 {table['name']} 需要指定 rows 或 fanout")
+        evaluation_order(columns)  # 检查公式列引用的列是否存在以及是否循环引用
+        planned[table["name"]] = {**table, "columns": columns}
+
+    # 为每个外键列记录父表主键的类型，写入数据库时用于建表
+    for table in planned.values():
+        for column in table["columns"]:
+            if column["type"] == FOREIGN_KEY:
+                parent_columns = {c["name"]: c for c in planned[column["parent"]]["columns"]}
+                key_type = parent_columns[column["key"]]["type"]
+                if key_type == FOREIGN_KEY:
+                    raise ValueError(f"外键 {table['name']}.{column['name']} 不能引用另一个外键列")
+                column["key_type"] = key_type
+
+    ordered = []
+    visiting = set()
+
+    def visit(name):
+        if any(t["name"] == name for t in ordered):
+            return
+        if name in visiting:
+            raise ValueError(f"表之间存在循环引用: {name}")
+        visiting.add(name)
+        for column in planned[name]["columns"]:
+            if column["type"] == FOREIGN_KEY:
+                visit(column["parent"])
+        visiting.discard(name)
+        ordered.append(planned[name])
+
+    for table in tables:
+        visit(table["name"])
+    return ordered
+
+
+# 按名称获取多表预设的副本
+def get_relational_preset(name):
+    if name not in relational_presets:
+        raise KeyError(f"未知的多表预设: {name}（可选: {', '.join(relational_presets)}）")
+    return plan_tables(copy.deepcopy(relational_presets[name]))
+
+
+# 从 JSON 或 YAML 文件加载多表配置，文件内容为带 tables 键的对象
+def load_tables(path):
+    schema = read_schema_file(path)
+    if not isinstance(schema, dict) or not isinstance(schema.get("tables"), list):
+        raise ValueError(f"模式文件中没有 tables 配置: {path}")
+    return plan_tables(schema)
+
+
+# 写出或建表时使用的列配置：外键列的类型替换为所引用主键的类型
+def output_specs(table):
+    return [
+        {"name": column["name"], "type": column["key_type"]} if column["type"] == FOREIGN_KEY else column
+        for column in table["columns"]
+    ]
+
+
+# 按扇出分布为 num_parents 个父行抽取子行数
+def fanout_counts(fanout, num_parents, rng):
+    distribution = fanout.get("distribution", "uniform")
+    if distribution == "fixed":
+        counts = np.full(num_parents, int(fanout.get("count", 1)), dtype=np.int64)
+    elif distribution == "uniform":
+        counts = rng.integers(int(fanout.get("min", 0)), int(fanout.get("max", 10)), size=num_parents, endpoint=True)
+    elif distribution == "poisson":
+        counts = rng.poisson(float(fanout.get("mean", 1.0)), size=num_parents)
+    elif distribution == "zipf":
+        counts = rng.zipf(float(fanout.get("a", 2.0)), size=num_parents)  # 长尾：少数父行拥有大量子行
+    else:
+        raise ValueError(f"不支持的扇出分布: {distribution}")
+    return np.clip(counts, int(fanout.get("min", 0)), fanout.get("max"))
+
+
+# 一对多：逐块抽取父行的子行数，把父行下标按子行数展开，再切成 chunk_rows 行的分块
+def _fanout_positions(fanout, num_parents, seed, chunk_rows):
+    buffer = []
+    buffered = 0
+    for block, start in enumerate(range(0, num_parents, _FANOUT_BLOCK)):
+        stop = min(start + _FANOUT_BLOCK, num_parents)
+        rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(_FANOUT_STREAM, block)))
+        positions = np.repeat(np.arange(start, stop, dtype=np.int64), fanout_counts(fanout, stop - start, rng))
+        buffer.append(positions)
+        buffered += len(positions)
+        while buffered >= chunk_rows:
+            merged = np.concatenate(buffer)
+            yield merged[:chunk_rows]
+            buffer = [merged[chunk_rows:]]
+            buffered = len(buffer[0])
+    if buffered:
+        yield np.concatenate(buffer)
+
+
+# 生成一张表的第 block 个行块：普通列与单表生成相同，外键列按父行下标从主键索引中取值
+# fanout_positions 为一对多外键在本行块中的父行下标，其余外键列随机引用父行
+def _build_table_block(table, num_rows, seed, block, offset, pools, indexes, fanout_positions, profiler):
+    fanout_column = (table.get("fanout") or {}).get("column")
+    data = {}
+    for spec in evaluation_order(table["columns"]):
+        rng = column_rng(seed, block, spec["name"])
+        with profiler.measure("cells", f"{table['name']}.{spec['name']}", num_rows) as entry:
+            if spec["type"] == FOREIGN_KEY:
+                key_index = indexes[(spec["parent"], spec["key"])]
+                if spec["name"] == fanout_column:
+                    positions = fanout_positions
+                elif len(key_index) == 0:
+                    raise ValueError(f"父表 {spec['parent']} 没有数据，无法生成外键 {table['name']}.{spec['name']}")
+                else:
+                    positions = rng.integers(0, len(key_index), size=num_rows)
+                data[spec["name"]] = key_index.take(positions)
+            else:
+                data[spec["name"]] = generate_column(spec, num_rows, rng, pools, offset, data)
+            if entry is not None:
+                entry["bytes"] = memory_of(data[spec["name"]])
+    with profiler.measure("frame", table["name"], num_rows):
+        return pd.DataFrame({spec["name"]: data[spec["name"]] for spec in table["columns"]})
+
+
+# 把按行块生成的 DataFrame 重新切分为 chunk_rows 行的分块
+def _rechunk(frames, chunk_rows):
+    buffer = []
+    buffered = 0
+    for frame in frames:
+        buffer.append(frame)
+        buffered += len(frame)
+        while buffered >= chunk_rows:
+            merged = pd.concat(buffer, ignore_index=True) if len(buffer) > 1 else buffer[0]
+            yield merged.iloc[:chunk_rows].reset_index(drop=True)
+            buffer = [merged.iloc[chunk_rows:]]
+            buffered = len(buffer[0])
+    if buffered:
+        yield pd.concat(buffer, ignore_index=True)
+
+
+def _table_chunks(table, seed, chunk_rows, locale, indexes, profiler):
+    plain_specs = [spec for spec in table["columns"] if spec["type"] != FOREIGN_KEY]
+    pools = prepare_pools(plain_specs, seed, table.get("locale", locale), profiler)
+    own_indexes = {key: value for key, value in indexes.items() if key[0] == table["name"]}
+    for spec in table["columns"]:
+        if spec["type"] == FOREIGN_KEY and indexes[(spec["parent"], spec["key"])].keys is None:
+            raise RuntimeError(f"父表 {spec['parent']} 的分块尚未全部生成，请按 generate_tables 返回的顺序依次读取")
+
+    fanout = table.get("fanout")
+    if fanout is not None:
+        parent_index = next(
+            indexes[(spec["parent"], spec["key"])] for spec in table["columns"] if spec["name"] == fanout["column"]
+        )
+        positions = _fanout_positions(fanout, len(parent_index), seed, RNG_BLOCK_ROWS)
+        batches = ((len(block_positions), block_positions) for block_positions in positions)
+    else:
+        batches = ((rows, None) for rows in chunk_sizes(int(table["rows"]), RNG_BLOCK_ROWS))
+
+    # 按固定大小的行块生成（与单表生成使用同样的行块），再切分为 chunk_rows 行的分块，生成的数据与 chunk_rows 无关
+    def blocks():
+        offset = 0
+        for block, (rows, positions) in enumerate(batches):
+            yield _build_table_block(table, rows, seed, block, offset, pools, indexes, positions, profiler)
+            offset += rows
+
+    for chunk in _rechunk(blocks(), chunk_rows):
+        for (_, column), key_index in own_indexes.items():
+            key_index.append(chunk[column])
+        yield chunk
+    for key_index in own_indexes.values():
+        key_index.freeze()
+
+
+# 第 position 张表的主种子，由整体的主种子派生
+def table_seed(seed, position):
+    return int(np.random.SeedSequence(seed, spawn_key=(_TABLE_STREAM, position)).generate_state(1, np.uint64)[0])
+
+
+# 按引用顺序依次产出 (表配置, 分块生成器)；必须读完前一张表的全部分块再读取下一张表，
+# 因为子表的外键取自父表生成过程中收集的主键索引
+def generate_tables(tables, seed=None, chunk_rows=100_000, locale="zh_CN", profiler=NULL_PROFILER):
+    tables = plan_tables(tables)
+    seed = resolve_seed(seed)
+    indexes = {}
+    for table in tables:
+        for spec in table["columns"]:
+            if spec["type"] == FOREIGN_KEY:
+                key = (spec["parent"], spec["key"])
+                if key not in indexes:
+                    indexes[key] = KeyIndex(spec["key_type"])
+    for position, table in enumerate(tables):
+        yield table, _table_chunks(table, table_seed(seed, position), chunk_rows, locale, indexes, profiler)
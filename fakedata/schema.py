@@ -0,0 +1,75 @@
+# 列配置的加载与补全：支持行业预设名称，以及 JSON / YAML 格式的模式文件
+import copy
+import json
+from datetime import date
+
+from fakedata.expressions import FORMULA, compile_expression, evaluation_order
+from fakedata.presets import COLUMN_TYPES, DISTRIBUTIONS, RANDOM_ID_MAX, default_columns
+
+
+# 按界面的默认值补全列配置，使预设和模式文件可以脱离界面直接生成
+def fill_defaults(specs):
+    today = date.today()
+    filled = []
+    for spec in specs:
+        spec = dict(spec)
+        if "name" not in spec or "type" not in spec:
+            raise ValueError(f"列配置缺少 name 或 type: {spec}")
+        if spec["type"] not in COLUMN_TYPES:
+            raise ValueError(f"不支持的数据类型: {spec['type']}")
+        if spec.get("distribution") and spec["distribution"] not in DISTRIBUTIONS:
+            raise ValueError(f"不支持的分布: {spec['distribution']}（可选: {', '.join(DISTRIBUTIONS)}）")
+        if spec["type"] == "整数":
+            spec.setdefault("min", 0)
+            spec.setdefault("max", 100)
+        elif spec["type"] == "小数":
+            spec.setdefault("min", 0.0)
+            spec.setdefault("max", 100.0)
+        elif spec["type"] in ["姓名", "公司", "城市", "国家", "列名"]:
+            spec.setdefault("unique_count", 5)
+        elif spec["type"] == "日期":
+            spec.setdefault("start_date", date(today.year, 1, 1))  # 默认为当年1月1日
+            spec.setdefault("end_date", today)  # 默认为当天
+        elif spec["type"] in ["自增ID", "编码"]:
+            spec.setdefault("min", 1)  # 起始值
+        elif spec["type"] == "随机ID":
+            spec.setdefault("min", 1)
+            spec.setdefault("max", RANDOM_ID_MAX)
+        elif spec["type"] in ["UUIDv7", "ULID"]:
+            spec.setdefault("start_date", date(today.year, 1, 1))  # 第一行的时间戳
+        elif spec["type"] == FORMULA:
+            compile_expression(spec.get("expression") or spec.get("custom_values"))  # 提前报告语法错误
+        filled.append(spec)
+    return filled
+
+
+# 按行业名称获取预设列配置的副本
+def get_preset(name):
+    if name not in default_columns:
+        raise KeyError(f"未知的行业预设: {name}（可选: {', '.join(default_columns)}）")
+    return fill_defaults(copy.deepcopy(default_columns[name]))
+
+
+# 读取 JSON 或 YAML 格式的模式文件，返回解析后的原始内容
+def read_schema_file(path):
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    if str(path).endswith((".yaml", ".yml")):
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError("读取 YAML 模式文件需要安装 PyYAML: pip install pyyaml") from None
+        return yaml.safe_load(text)
+    return json.loads(text)
+
+
+# 从 JSON 或 YAML 文件加载列配置；文件内容可以是列配置列表，也可以是带 columns 键的对象
+def load_schema(path):
+    schema = read_schema_file(path)
+    if isinstance(schema, dict):
+        schema = schema.get("columns", [])
+    if not isinstance(schema, list) or not schema:
+        raise ValueError(f"模式文件中没有列配置: {path}")
+    specs = fill_defaults(schema)
+    evaluation_order(specs)  # 检查公式引用的列是否存在以及是否循环引用
+    return specs
@@ -0,0 +1,310 @@
+# 本地流式数据服务：基于 asyncio 的 HTTP 服务器，按分块生成数据并以 chunked 传输编码持续返回
+# 用法：fakedata serve --port 8000，然后
+#   curl "http://127.0.0.1:8000/generate?preset=电商&rows=1000000&seed=1&format=ndjson"
+#   curl -X POST "http://127.0.0.1:8000/generate?rows=1000&format=csv" -d '{"columns": [...]}'
+# 分块在共享的进程池中生成；每个连接同时在途的分块数受限，并在写出后等待 drain，
+# 客户端读取变慢时生成也随之放慢（背压），不会在内存中堆积数据
+import asyncio
+import json
+import logging
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from urllib.parse import parse_qs, urlsplit
+
+from fakedata.engine import (
+    RNG_BLOCK_ROWS,
+    build_chunk,
+    check_specs,
+    chunk_offsets,
+    chunk_sizes,
+    prepare_pools,
+    resolve_seed,
+)
+from fakedata.presets import default_columns
+from fakedata.schema import fill_defaults, get_preset
+from fakedata.writers import hex_binary
+
+# 支持的输出格式及其 Content-Type
+CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson; charset=utf-8",
+    "csv": "text/csv; charset=utf-8",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+_REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+logger = logging.getLogger("fakedata.server")
+
+# 请求体大小上限（仅用于提交列配置）
+MAX_BODY_BYTES = 1024 * 1024
+
+
+class RequestError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# 在工作进程中生成一个分块并序列化；arrow 格式需要跨分块共用一个流写出器，因此返回 DataFrame 由主进程写出
+def _render_chunk(specs, seed, num_rows, offset, total_rows, pools, fmt):
+    chunk = build_chunk(specs, num_rows, seed, pools, offset=offset, total_rows=total_rows)
+    if fmt in ("csv", "ndjson"):
+        chunk = hex_binary(chunk)
+    if fmt == "csv":
+        return chunk.to_csv(index=False, header=offset == 0).encode("utf-8")
+    if fmt == "ndjson":
+        text = chunk.to_json(orient="records", lines=True, force_ascii=False)
+        return (text if text.endswith("\n") else text + "\n").encode("utf-8")
+    return chunk
+
+
+# 将多个分块写成一个 Arrow IPC 流，每次返回新写出的字节
+class ArrowStreamEncoder:
+    def __init__(self):
+        self._sink = BytesIO()
+        self._writer = None
+        self._schema = None
+
+    def _take(self):
+        data = self._sink.getvalue()
+        self._sink.seek(0)
+        self._sink.truncate()
+        return data
+
+    def encode(self, chunk):
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(chunk, schema=self._schema, preserve_index=False)
+        if self._writer is None:
+            self._schema = table.schema
+            self._writer = pa.ipc.new_stream(self._sink, self._schema)
+        self._writer.write_table(table)
+        return self._take()
+
+    def close(self):
+        if self._writer is None:
+            return b""
+        self._writer.close()
+        return self._take()
+
+
+def _first(query, name, default=None):
+    values = query.get(name)
+    return values[0] if values else default
+
+
+def _int_param(query, body, name, default=None):
+    value = _first(query, name, body.get(name, default))
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise RequestError(400, f"参数 {name} 必须是整数") from None
+
+
+class DataServer:
+    def __init__(self, host="127.0.0.1", port=8000, workers=None, chunk_rows=50_000, max_inflight=None):
+        self.host = host
+        self.port = port
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_rows = chunk_rows
+        # 每个连接同时在途的分块数，默认与工作进程数相同，单个客户端也能用满所有工作进程
+        self.max_inflight = max_inflight or self.workers
+        self.executor = None
+
+    async def serve_forever(self):
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        server = await asyncio.start_server(self._handle, self.host, self.port)
+        print(f"数据服务已启动: http://{self.host}:{self.port}（{self.workers} 个工作进程）", file=sys.stderr)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _handle(self, reader, writer):
+        try:
+            method, path, query, body = await self._read_request(reader)
+            if path == "/presets" and method == "GET":
+                payload = {name: len(columns) for name, columns in default_columns.items()}
+                await self._send_json(writer, 200, payload)
+            elif path == "/generate":
+                if method not in ("GET", "POST"):
+                    raise RequestError(405, "只支持 GET 和 POST")
+                await self._generate(writer, query, body)
+            else:
+                raise RequestError(404, f"未知的路径: {path}")
+        except RequestError as e:
+            await self._send_json(writer, e.status, {"error": str(e)})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass  # 客户端提前断开
+        except Exception:
+            # 发送响应头之前的意外错误：记录日志并返回 500
+            logger.exception("处理请求时出错")
+            try:
+                await self._send_json(writer, 500, {"error": "服务器内部错误"})
+            except ConnectionError:
+                pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _read_request(self, reader):
+        request_line = (await reader.readline()).decode("latin-1").strip()
+        parts = request_line.split()
+        if len(parts) != 3:
+            raise RequestError(400, "无效的请求行")
+        method, target, _ = parts
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        body = {}
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise RequestError(400, "无效的 Content-Length") from None
+        if length < 0:
+            raise RequestError(400, "无效的 Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise RequestError(413, "请求体过大")
+        if length:
+            try:
+                body = json.loads(await reader.readexactly(length))
+            except ValueError:
+                raise RequestError(400, "请求体必须是 JSON") from None
+            if isinstance(body, list):
+                body = {"columns": body}
+            if not isinstance(body, dict):
+                raise RequestError(400, "请求体必须是 JSON 对象或列配置列表")
+        url = urlsplit(target)
+        return method, url.path, parse_qs(url.query), body
+
+    # 解析并校验生成参数；所有能预先发现的错误都在发送响应头之前以 400 返回
+    def _parse_job(self, query, body):
+        preset = _first(query, "preset", body.get("preset"))
+        columns = body.get("columns")
+        if columns and not (isinstance(columns, list) and all(isinstance(column, dict) for column in columns)):
+            raise RequestError(400, "columns 必须是列配置对象的列表")
+        try:
+            if columns:
+                specs = fill_defaults(columns)
+            elif preset:
+                specs = get_preset(preset)
+            else:
+                raise RequestError(400, "需要 preset 参数或在请求体中提交 columns")
+        except (KeyError, ValueError) as e:
+            raise RequestError(400, e.args[0] if e.args else str(e)) from None
+        num_rows = _int_param(query, body, "rows")
+        if num_rows is None or num_rows < 0:
+            raise RequestError(400, "需要非负整数参数 rows")
+        try:
+            check_specs(specs, num_rows)
+        except ValueError as e:
+            raise RequestError(400, str(e)) from None
+        fmt = _first(query, "format", body.get("format", "ndjson"))
+        if fmt not in CONTENT_TYPES:
+            raise RequestError(400, f"不支持的格式: {fmt}（可选: {', '.join(CONTENT_TYPES)}）")
+        chunk_rows = _int_param(query, body, "chunk_rows", self.chunk_rows)
+        if chunk_rows < 1:
+            raise RequestError(400, "chunk_rows 必须大于 0")
+        # 向上取整为随机流行块的整数倍：分块与行块对齐，工作进程不会为很小的分块生成整个行块
+        chunk_rows = -(-chunk_rows // RNG_BLOCK_ROWS) * RNG_BLOCK_ROWS
+        seed = _int_param(query, body, "seed")
+        if seed is not None and seed < 0:
+            raise RequestError(400, "seed 必须是非负整数")
+        seed = resolve_seed(seed)
+        locale = _first(query, "locale", body.get("locale", "zh_CN"))
+        from faker.config import AVAILABLE_LOCALES
+
+        for value in [locale] + [spec["locale"] for spec in specs if spec.get("locale")]:
+            if value not in AVAILABLE_LOCALES:
+                raise RequestError(400, f"不支持的语言区域: {value}")
+        return specs, num_rows, fmt, chunk_rows, seed, locale
+
+    async def _generate(self, writer, query, body):
+        specs, num_rows, fmt, chunk_rows, seed, locale = self._parse_job(query, body)
+        loop = asyncio.get_running_loop()
+        pools = await loop.run_in_executor(None, prepare_pools, specs, seed, locale)  # 可能需要读取或构建数据池
+
+        headers = [
+            "HTTP/1.1 200 OK",
+            f"Content-Type: {CONTENT_TYPES[fmt]}",
+            "Transfer-Encoding: chunked",
+            f"X-Fakedata-Seed: {seed}",
+            f"X-Fakedata-Rows: {num_rows}",
+            "Connection: close",
+        ]
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1"))
+
+        encoder = ArrowStreamEncoder() if fmt == "arrow" else None
+        pending = deque()
+        try:
+            sizes = chunk_sizes(num_rows, chunk_rows)
+            for rows, offset in zip(sizes, chunk_offsets(sizes)):
+                pending.append(
+                    loop.run_in_executor(self.executor, _render_chunk, specs, seed, rows, offset, num_rows, pools, fmt)
+                )
+                if len(pending) >= self.max_inflight:
+                    await self._send_chunk(writer, await pending.popleft(), encoder)
+            while pending:
+                await self._send_chunk(writer, await pending.popleft(), encoder)
+            if encoder is not None:
+                await self._write_chunk(writer, encoder.close())
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+        except ConnectionError:
+            raise
+        except Exception:
+            # 响应头已经发出，无法再返回错误状态：记录日志后直接断开，不发送结束分块，客户端据此得知响应不完整
+            logger.exception("流式生成时出错，已中止响应")
+            writer.transport.abort()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def _send_chunk(self, writer, rendered, encoder):
+        if encoder is not None:
+            loop = asyncio.get_running_loop()
+            rendered = await loop.run_in_executor(None, encoder.encode, rendered)
+        await self._write_chunk(writer, rendered)
+
+    async def _write_chunk(self, writer, data):
+        if not data:
+            return
+        writer.write(f"{len(data):X}\r\n".encode("ascii"))
+        writer.write(data)
+        writer.write(b"\r\n")
+        await writer.drain()  # 背压：等待客户端读取后再继续
+
+    async def _send_json(self, writer, status, payload):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            "Connection: close\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + data)
+        await writer.drain()
+
+
+def serve(host="127.0.0.1", port=8000, workers=None, chunk_rows=50_000, max_inflight=None):
+    server = DataServer(host, port, workers=workers, chunk_rows=chunk_rows, max_inflight=max_inflight)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,261 @@
+# 数据库写入：把生成的分块直接批量写入 SQLite、PostgreSQL 或 MySQL，无需先导出文件再手动导入
+# PostgreSQL 使用 COPY，SQLite 和 MySQL 使用多行批量 executemany；每个分块在一个事务中写入
+# 并行写入时每个线程从连接池借用独立的连接
+# PostgreSQL 需要 psycopg（或 psycopg2），MySQL 需要 PyMySQL，均在使用时才导入
+import queue
+import sqlite3
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from io import StringIO
+from urllib.parse import unquote, urlsplit
+
+from fakedata.expressions import FORMULA, expression_type
+from fakedata.writers import hex_binary
+
+# binary: true 的 UUIDv7 / ULID 列保存为 16 字节二进制
+BINARY = "二进制"
+
+# 各数据库中每种数据类型对应的列类型
+SQL_TYPES = {
+    "sqlite": {
+        "整数": "INTEGER", "小数": "REAL", "日期": "TEXT", "UUID": "TEXT",
+        "自增ID": "INTEGER", "随机ID": "INTEGER", "UUIDv7": "TEXT", "ULID": "TEXT", None: "TEXT",
+        BINARY: "BLOB",
+    },
+    "postgresql": {
+        "整数": "BIGINT", "小数": "DOUBLE PRECISION", "日期": "DATE", "UUID": "UUID",
+        "自增ID": "BIGINT", "随机ID": "BIGINT", "UUIDv7": "UUID", "ULID": "CHAR(26)", None: "TEXT",
+        BINARY: "BYTEA",
+    },
+    "mysql": {
+        "整数": "BIGINT", "小数": "DOUBLE", "日期": "DATE", "UUID": "CHAR(36)",
+        "自增ID": "BIGINT", "随机ID": "BIGINT", "UUIDv7": "CHAR(36)", "ULID": "CHAR(26)", None: "VARCHAR(255)",
+        BINARY: "BINARY(16)",
+    },
+}
+
+
+# 简单的线程安全连接池：连接按需创建，最多 size 个，用完归还
+class ConnectionPool:
+    def __init__(self, connect, size=1):
+        self._connect = connect
+        self._idle = queue.LifoQueue()
+        self._slots = queue.Queue()
+        for _ in range(size):
+            self._slots.put(None)
+        self._all = []
+
+    @contextmanager
+    def connection(self):
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            try:
+                self._slots.get_nowait()
+            except queue.Empty:
+                conn = self._idle.get()  # 已达到上限时等待其他线程归还连接
+            else:
+                try:
+                    conn = self._connect()
+                except BaseException:
+                    self._slots.put(None)
+                    raise
+                self._all.append(conn)
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self):
+        for conn in self._all:
+            conn.close()
+        self._all.clear()
+
+
+class Sink:
+    dialect = None
+    quote = '"'
+    placeholder = "?"
+
+    def __init__(self, table, specs, batch_size=10_000, pool_size=1, if_exists="append"):
+        if if_exists not in ("fail", "replace", "append"):
+            raise ValueError(f"if_exists 只能是 fail、replace 或 append: {if_exists}")
+        self.table = table
+        self.specs = specs
+        self.batch_size = batch_size
+        self.if_exists = if_exists
+        self.pool = ConnectionPool(self.connect, pool_size)
+
+    def connect(self):
+        raise NotImplementedError
+
+    def quote_name(self, name):
+        return self.quote + str(name).replace(self.quote, self.quote * 2) + self.quote
+
+    def column_list(self):
+        return ", ".join(self.quote_name(spec["name"]) for spec in self.specs)
+
+    # 公式列按表达式推断结果的类型
+    def column_type(self, spec):
+        if spec.get("binary") and spec["type"] in ("UUIDv7", "ULID"):
+            return BINARY
+        if spec["type"] == FORMULA:
+            return expression_type(spec, self.specs)
+        return spec["type"]
+
+    # 根据列的数据类型生成建表语句
+    def create_table_sql(self):
+        types = SQL_TYPES[self.dialect]
+        columns = ", ".join(
+            f"{self.quote_name(spec['name'])} {types.get(self.column_type(spec), types[None])}" for spec in self.specs
+        )
+        if_not_exists = "IF NOT EXISTS " if self.if_exists == "append" else ""
+        return f"CREATE TABLE {if_not_exists}{self.quote_name(self.table)} ({columns})"
+
+    def table_exists(self, conn):
+        cursor = conn.cursor()
+        try:
+            cursor.execute(f"SELECT 1 FROM {self.quote_name(self.table)} WHERE 1 = 0")
+            cursor.fetchall()
+            return True
+        except Exception:
+            conn.rollback()
+            return False
+
+    def create_table(self):
+        with self.pool.connection() as conn:
+            if self.if_exists == "fail" and self.table_exists(conn):
+                raise ValueError(f"表 {self.table} 已存在")
+            cursor = conn.cursor()
+            if self.if_exists == "replace":
+                cursor.execute(f"DROP TABLE IF EXISTS {self.quote_name(self.table)}")
+            cursor.execute(self.create_table_sql())
+            conn.commit()
+
+    # 以 batch_size 行为一批调用 executemany
+    def insert_rows(self, cursor, chunk):
+        placeholders = ", ".join([self.placeholder] * len(self.specs))
+        sql = f"INSERT INTO {self.quote_name(self.table)} ({self.column_list()}) VALUES ({placeholders})"
+        rows = chunk.itertuples(index=False, name=None)
+        while True:
+            batch = [row for _, row in zip(range(self.batch_size), rows)]
+            if not batch:
+                break
+            cursor.executemany(sql, batch)
+
+    # 在一个事务中写入一个分块，出错时回滚
+    def write_chunk(self, chunk):
+        with self.pool.connection() as conn:
+            try:
+                self.insert_rows(conn.cursor(), chunk)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        return len(chunk)
+
+    # 写入所有分块并返回总行数；workers 大于 1 时多个连接并行写入
+    def write(self, chunks, workers=1):
+        self.create_table()
+        if workers <= 1:
+            return sum(self.write_chunk(chunk) for chunk in chunks)
+        total_rows = 0
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(self.write_chunk, chunk))
+                if len(pending) >= workers * 2:
+                    total_rows += pending.popleft().result()
+            while pending:
+                total_rows += pending.popleft().result()
+        return total_rows
+
+    def close(self):
+        self.pool.close()
+
+
+class SQLiteSink(Sink):
+    dialect = "sqlite"
+
+    def __init__(self, path, table, specs, **kwargs):
+        self.path = path
+        super().__init__(table, specs, **kwargs)
+
+    def connect(self):
+        conn = sqlite3.connect(self.path, timeout=60, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")  # 并行写入时读者不被阻塞
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+
+class PostgresSink(Sink):
+    dialect = "postgresql"
+    placeholder = "%s"
+
+    def __init__(self, dsn, table, specs, **kwargs):
+        self.dsn = dsn
+        super().__init__(table, specs, **kwargs)
+
+    def connect(self):
+        try:
+            import psycopg
+        except ImportError:
+            try:
+                import psycopg2 as psycopg
+            except ImportError:
+                raise ImportError("写入 PostgreSQL 需要安装 psycopg: pip install psycopg") from None
+        return psycopg.connect(self.dsn)
+
+    # 使用 COPY ... FROM STDIN 批量写入，每 batch_size 行发送一次；二进制列按 bytea 的十六进制格式写出
+    def insert_rows(self, cursor, chunk):
+        chunk = hex_binary(chunk, prefix="\\x")
+        sql = f"COPY {self.quote_name(self.table)} ({self.column_list()}) FROM STDIN WITH (FORMAT csv)"
+        for start in range(0, len(chunk), self.batch_size):
+            text = chunk.iloc[start:start + self.batch_size].to_csv(index=False, header=False)
+            if hasattr(cursor, "copy"):  # psycopg 3
+                with cursor.copy(sql) as copy:
+                    copy.write(text)
+            else:  # psycopg2
+                cursor.copy_expert(sql, StringIO(text))
+
+
+class MySQLSink(Sink):
+    dialect = "mysql"
+    quote = "`"
+    placeholder = "%s"
+
+    def __init__(self, dsn, table, specs, **kwargs):
+        self.dsn = dsn
+        super().__init__(table, specs, **kwargs)
+
+    def connect(self):
+        try:
+            import pymysql
+        except ImportError:
+            raise ImportError("写入 MySQL 需要安装 PyMySQL: pip install pymysql") from None
+        url = urlsplit(self.dsn)
+        return pymysql.connect(
+            host=url.hostname or "localhost",
+            port=url.port or 3306,
+            user=unquote(url.username or ""),
+            password=unquote(url.password or ""),
+            database=url.path.lstrip("/"),
+            charset="utf8mb4",
+            autocommit=False,
+        )
+
+
+# 根据连接地址选择写入目标：sqlite:///相对路径.db、sqlite:////绝对路径.db、postgresql://...、mysql://...
+def open_sink(dsn, table, specs, **kwargs):
+    scheme, sep, rest = dsn.partition("://")
+    scheme = scheme.split("+", 1)[0].lower() if sep else ""
+    if scheme == "sqlite":
+        return SQLiteSink(rest[1:] if rest.startswith("/") else rest, table, specs, **kwargs)
+    if scheme in ("postgresql", "postgres"):
+        return PostgresSink(dsn, table, specs, **kwargs)
+    if scheme == "mysql":
+        return MySQLSink(dsn, table, specs, **kwargs)
+    if not scheme:
+        return SQLiteSink(dsn, table, specs, **kwargs)  # 不带协议时视为 SQLite 文件路径
+    raise ValueError(f"不支持的数据库: {dsn}")
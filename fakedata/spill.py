@@ -0,0 +1,166 @@
+# 大数据集落盘：超过阈值的数据集按分块写入临时目录中的 Arrow IPC 文件，会话中只保存一个轻量的句柄
+# 预览时以内存映射方式打开文件，按页或抽样读取，不需要把整张表载入内存；导出的下载文件也保存在这里
+# 磁盘占用超过预算时按 LRU 删除最早的文件
+import atexit
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+
+from fakedata.writers import write_arrow
+
+# 默认磁盘预算（MB）和触发落盘的单元格数（行数 × 列数），可通过环境变量调整
+DEFAULT_SPILL_MB = int(os.environ.get("FAKEDATA_SPILL_MB", "4096"))
+SPILL_CELLS = int(os.environ.get("FAKEDATA_SPILL_CELLS", "1000000"))
+
+# 临时文件的父目录，默认为系统临时目录
+DEFAULT_SPILL_DIR = os.environ.get("FAKEDATA_SPILL_DIR") or tempfile.gettempdir()
+
+
+# 落盘数据集的句柄：只记录文件路径，读取时才内存映射打开
+class SpilledDataset:
+    def __init__(self, path, num_rows, columns):
+        self.path = path
+        self.num_rows = num_rows
+        self.columns = columns
+
+    def __len__(self):
+        return self.num_rows
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    # 以内存映射方式打开文件，返回的 Arrow 表直接引用映射的页面，不复制数据
+    def table(self):
+        import pyarrow as pa
+
+        return pa.ipc.open_file(pa.memory_map(self.path)).read_all()
+
+    # 读取从 start 开始的 size 行，索引为行号
+    def page(self, start, size):
+        frame = self.table().slice(start, size).to_pandas()
+        frame.index = range(start, start + len(frame))
+        return frame
+
+    # 不放回地随机抽取 size 行，按原顺序返回
+    def sample(self, size, seed=None):
+        import numpy as np
+
+        size = min(size, self.num_rows)
+        rows = np.sort(np.random.default_rng(seed).choice(self.num_rows, size=size, replace=False))
+        frame = self.table().take(rows).to_pandas()
+        frame.index = rows
+        return frame
+
+    # 按写入时的分块逐块读出，供导出使用
+    def iter_chunks(self):
+        import pyarrow as pa
+
+        reader = pa.ipc.open_file(pa.memory_map(self.path))
+        for index in range(reader.num_record_batches):
+            yield reader.get_batch(index).to_pandas()
+
+    def to_pandas(self):
+        return self.table().to_pandas()
+
+
+# 落盘的导出文件句柄，点击下载时才读取文件内容
+class SpilledFile:
+    def __init__(self, path):
+        self.path = path
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    # 读出整个文件；下载按钮只在用户点击下载时才调用
+    def read(self):
+        with open(self.path, "rb") as file:
+            return file.read()
+
+
+# 进程内共享的落盘存储：每个进程使用单独的临时目录，退出时删除
+class SpillStore:
+    def __init__(self, root=None, max_bytes=DEFAULT_SPILL_MB * 1024 * 1024):
+        os.makedirs(root or DEFAULT_SPILL_DIR, exist_ok=True)
+        self.root = tempfile.mkdtemp(prefix="fakedata-spill-", dir=root or DEFAULT_SPILL_DIR)
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # 键 -> (句柄, 文件字节数)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        atexit.register(shutil.rmtree, self.root, True)
+
+    # 返回仍在磁盘上的数据集句柄，并标记为最近使用
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    # 调用 write(路径) 写出新文件；先写临时文件再重命名，读取者不会看到写了一半的文件
+    def _write_file(self, write, suffix):
+        path = os.path.join(self.root, f"{uuid.uuid4().hex}{suffix}")
+        partial = path + ".partial"
+        try:
+            write(partial)
+            os.replace(partial, path)
+        except BaseException:
+            if os.path.exists(partial):
+                os.remove(partial)
+            raise
+        return path
+
+    # 登记写好的文件，磁盘占用超过预算时删除最早使用的文件
+    def _register(self, key, handle):
+        size = os.path.getsize(handle.path)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (handle, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                self._remove(next(iter(self._entries)))
+        return handle
+
+    # 把分块写入新的 Arrow 文件并登记
+    def put(self, key, chunks):
+        num_rows = 0
+        columns = []
+
+        def counted(chunks):
+            nonlocal num_rows, columns
+            for chunk in chunks:
+                num_rows += len(chunk)
+                columns = list(chunk.columns)
+                yield chunk
+
+        path = self._write_file(lambda partial: write_arrow(counted(chunks), partial), ".arrow")
+        return self._register(key, SpilledDataset(path, num_rows, columns))
+
+    # 导出文件同样写入临时目录并计入磁盘预算：write(路径) 负责写出文件内容，suffix 为扩展名
+    def put_file(self, key, write, suffix=""):
+        return self._register(key, SpilledFile(self._write_file(write, suffix)))
+
+    # 删除文件；已被其他会话内存映射的文件在 Linux 上仍可读取，直到映射关闭
+    def _remove(self, key):
+        dataset, size = self._entries.pop(key)
+        self._bytes -= size
+        try:
+            os.remove(dataset.path)
+        except OSError:
+            pass
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._entries):
+                self._remove(key)
+
+    @property
+    def size_bytes(self):
+        return self._bytes
+
+    def __len__(self):
+        return len(self._entries)
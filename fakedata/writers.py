@@ -0,0 +1,148 @@
+# 分块写出：逐块消费 generate_chunks 产出的 DataFrame，不在内存中拼接整张表
+# 所有写出函数都接受文件路径或二进制文件对象，并返回写出的总行数
+import gzip
+from io import BytesIO
+
+# Excel 单个工作表最多 1,048,576 行，其中一行为表头
+XLSX_MAX_ROWS = 1_048_575
+
+# 支持的导出格式：格式名 -> (显示名称, 文件扩展名, MIME 类型)
+EXPORT_FORMATS = {
+    "xlsx": ("Excel", ".xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "csv": ("CSV", ".csv", "text/csv"),
+    "csv.gz": ("CSV (gzip)", ".csv.gz", "application/gzip"),
+    "parquet": ("Parquet", ".parquet", "application/vnd.apache.parquet"),
+    "arrow": ("Arrow IPC / Feather", ".arrow", "application/vnd.apache.arrow.file"),
+}
+
+
+def _open_binary(path_or_buf):
+    if hasattr(path_or_buf, "write"):
+        return path_or_buf, False
+    return open(path_or_buf, "wb"), True
+
+
+# 逐块写出 CSV，只在第一块写入表头
+def write_csv(chunks, path_or_buf, encoding="utf-8"):
+    handle, should_close = _open_binary(path_or_buf)
+    total_rows = 0
+    try:
+        for chunk in chunks:
+            chunk = hex_binary(chunk)
+            handle.write(chunk.to_csv(header=not total_rows, index=False).encode(encoding))
+            total_rows += len(chunk)
+    finally:
+        if should_close:
+            handle.close()
+    return total_rows
+
+
+# 逐块写出 gzip 压缩的 CSV
+def write_csv_gzip(chunks, path_or_buf, encoding="utf-8"):
+    handle, should_close = _open_binary(path_or_buf)
+    try:
+        with gzip.GzipFile(fileobj=handle, mode="wb") as gz:
+            return write_csv(chunks, gz, encoding=encoding)
+    finally:
+        if should_close:
+            handle.close()
+
+
+# 以第一块的结构为准，将每块转换为 Arrow 表后交给 write_table 写出
+def _write_arrow_tables(chunks, open_writer):
+    import pyarrow as pa
+
+    writer = None
+    schema = None
+    total_rows = 0
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+            if writer is None:
+                schema = table.schema
+                writer = open_writer(schema)
+            writer.write_table(table)
+            total_rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return total_rows
+
+
+# 逐块写出 Parquet，每块对应一个行组
+def write_parquet(chunks, path_or_buf, compression="snappy"):
+    import pyarrow.parquet as pq
+
+    return _write_arrow_tables(chunks, lambda schema: pq.ParquetWriter(path_or_buf, schema, compression=compression))
+
+
+# 逐块写出 Arrow IPC 文件（即 Feather v2），可被内存映射读取
+def write_arrow(chunks, path_or_buf):
+    import pyarrow as pa
+
+    return _write_arrow_tables(chunks, lambda schema: pa.ipc.new_file(path_or_buf, schema))
+
+
+# 文本格式（CSV、NDJSON、Excel）不能直接保存二进制，16 字节的 ID 列转为十六进制字符串，prefix 加在每个值前
+def hex_binary(chunk, prefix=""):
+    for col in chunk.columns:
+        if chunk[col].dtype == object and len(chunk) and isinstance(chunk[col].iloc[0], bytes):
+            chunk = chunk.assign(**{col: chunk[col].map(lambda value: None if value is None else prefix + value.hex())})
+    return chunk
+
+
+# 逐块写出 Excel：使用 openpyxl 的只写模式，行写入临时文件而不是保存在内存中
+# 超过单个工作表的行数上限时自动续写到新的工作表
+def write_xlsx(chunks, path_or_buf, sheet_name="Generated Data"):
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = None
+    sheet_rows = 0
+    total_rows = 0
+    try:
+        for chunk in chunks:
+            chunk = hex_binary(chunk)
+            header = [str(col) for col in chunk.columns]
+            for row in chunk.itertuples(index=False, name=None):
+                if sheet is None or sheet_rows >= XLSX_MAX_ROWS:
+                    sheet_index = len(workbook.worksheets) + 1
+                    sheet = workbook.create_sheet(sheet_name if sheet_index == 1 else f"{sheet_name} {sheet_index}")
+                    sheet.append(header)
+                    sheet_rows = 0
+                sheet.append(row)
+                sheet_rows += 1
+            total_rows += len(chunk)
+    except BaseException:
+        # 写入中途失败或被取消时关闭各工作表，并删除 openpyxl 为其创建的临时文件
+        for written in workbook.worksheets:
+            written.close()
+            written._writer.cleanup()
+        raise
+    if sheet is None:
+        workbook.create_sheet(sheet_name)
+    workbook.save(path_or_buf)
+    return total_rows
+
+
+_WRITERS = {
+    "xlsx": write_xlsx,
+    "csv": write_csv,
+    "csv.gz": write_csv_gzip,
+    "parquet": write_parquet,
+    "arrow": write_arrow,
+}
+
+
+# 按格式名写出分块数据
+def write_chunks(chunks, path_or_buf, fmt):
+    if fmt not in _WRITERS:
+        raise ValueError(f"不支持的导出格式: {fmt}")
+    return _WRITERS[fmt](chunks, path_or_buf)
+
+
+# 将分块数据导出为指定格式的文件字节，供下载按钮使用
+def export_bytes(chunks, fmt):
+    buffer = BytesIO()
+    write_chunks(chunks, buffer, fmt)
+    return buffer.getvalue()
@@ -0,0 +1,5 @@
+# 测试使用独立的数据池目录，不读写用户目录下的数据池
+import os
+import tempfile
+
+os.environ.setdefault("FAKEDATA_POOL_DIR", os.path.join(tempfile.gettempdir(), "fakedata-test-pools"))
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fakedata.cache import DatasetCache
+from fakedata.engine import (
+    alias_draw,
+    alias_table,
+    check_specs,
+    generate_chunks,
+    generate_frame,
+    parse_weighted_values,
+    permute_ids,
+)
+from fakedata.schema import fill_defaults
+
+
+def test_weighted_values():
+    values, weights = parse_weighted_values("已支付:0.9, 未支付：0.1")
+    assert values == ["已支付", "未支付"]
+    assert weights.tolist() == [0.9, 0.1]
+
+
+def test_colon_values_are_not_weights():
+    assert parse_weighted_values("09:00, 12:30, 18:45") == (["09:00", "12:30", "18:45"], None)
+    assert parse_weighted_values("a:1, b") == (["a:1", "b"], None)
+    assert parse_weighted_values("A, B") == (["A", "B"], None)
+
+
+@pytest.mark.parametrize("custom_values", ["a:0, b:0", "a:-1, b:2"])
+def test_check_specs_rejects_invalid_weights(custom_values):
+    with pytest.raises(ValueError, match="权重"):
+        check_specs(fill_defaults([{"name": "状态", "type": "枚举", "custom_values": custom_values}]), 10)
+
+
+def test_clock_time_enum_draws_every_value():
+    specs = fill_defaults([{"name": "时间", "type": "枚举", "custom_values": "09:00, 12:30, 18:45"}])
+    counts = generate_frame(specs, 3000, seed=1)["时间"].value_counts()
+    assert set(counts.index) == {"09:00", "12:30", "18:45"}
+
+
+def test_alias_draw_frequencies():
+    weights = np.array([5.0, 1.0, 0.0, 3.0, 1.0])
+    draws = alias_draw(alias_table(weights), 200_000, np.random.default_rng(0))
+    frequencies = np.bincount(draws, minlength=len(weights)) / len(draws)
+    assert frequencies[2] == 0
+    assert np.allclose(frequencies, weights / weights.sum(), atol=0.01)
+
+
+def test_permute_ids_is_a_bijection():
+    keys = np.random.default_rng(3).integers(0, 2**64, size=4, dtype=np.uint64)
+    for domain in (1, 7, 1000, 4097):
+        ids = permute_ids(np.arange(domain, dtype=np.int64), domain, keys)
+        assert sorted(ids.tolist()) == list(range(domain))
+
+
+def test_random_ids_stay_in_range_and_unique():
+    specs = fill_defaults([{"name": "ID", "type": "随机ID", "min": 100, "max": 20_099}])
+    ids = generate_frame(specs, 20_000, seed=1)["ID"]
+    assert ids.is_unique and ids.between(100, 20_099).all()
+
+
+# 随机流按全局行块派生：分块大小不改变生成的数据
+@pytest.mark.parametrize("chunk_rows", [1000, 7777, 10_000, 100_000])
+def test_chunk_rows_do_not_change_values(chunk_rows):
+    specs = fill_defaults([
+        {"name": "单价", "type": "小数"},
+        {"name": "状态", "type": "枚举", "custom_values": "已支付:0.9, 未支付:0.1"},
+        {"name": "ID", "type": "随机ID", "min": 1, "max": 50_000},
+        {"name": "UUID", "type": "UUIDv7"},
+        {"name": "折扣价", "type": "公式", "expression": "round(单价 * uniform(0.5, 1), 2)"},
+    ])
+    expected = generate_frame(specs, 25_000, seed=1)
+    chunks = list(generate_chunks(specs, 25_000, chunk_rows=chunk_rows, seed=1))
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), expected)
+
+
+# 按列缓存时整张表直接引用缓存中的列，再次读取不会复制数据，也不会让缓存占用翻倍
+def test_cached_frame_shares_column_memory():
+    specs = fill_defaults([{"name": "单价", "type": "小数"}, {"name": "状态", "type": "枚举", "custom_values": "a, b"}])
+    cache = DatasetCache()
+    first = generate_frame(specs, 5000, seed=1, column_cache=cache)
+    size = cache.size_bytes
+    second = generate_frame(specs, 5000, seed=1, column_cache=cache)
+    assert cache.size_bytes == size and len(cache) == 2
+    assert np.shares_memory(first["单价"].values, second["单价"].values)
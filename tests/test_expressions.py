@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fakedata.cache import DatasetCache, column_key
+from fakedata.engine import generate_frame
+from fakedata.expressions import compile_expression, evaluation_order, expression_type
+from fakedata.schema import fill_defaults
+
+BASE = [
+    {"name": "数量", "type": "整数", "min": 1, "max": 10},
+    {"name": "单价", "type": "小数", "min": 10.0, "max": 500.0},
+    {"name": "发货日期", "type": "日期"},
+]
+
+
+def _frame(*formulas, rows=2000):
+    specs = fill_defaults(BASE + [{"name": name, "type": "公式", "expression": text} for name, text in formulas])
+    return generate_frame(specs, rows, seed=1)
+
+
+def test_arithmetic():
+    frame = _frame(("总金额", "round(数量 * 单价, 2)"))
+    assert np.array_equal(frame["总金额"], np.round(frame["数量"] * frame["单价"], 2))
+
+
+def test_date_offsets():
+    frame = _frame(("到达日期", "发货日期 + randint(1, 7) days"), ("次日", "发货日期 + 1天"), ("间隔", "到达日期 - 发货日期"))
+    gap = (pd.to_datetime(frame["到达日期"]) - pd.to_datetime(frame["发货日期"])).dt.days
+    assert gap.between(1, 7).all()
+    assert (gap == frame["间隔"]).all()
+    assert (pd.to_datetime(frame["次日"]) - pd.to_datetime(frame["发货日期"])).dt.days.eq(1).all()
+
+
+def test_where_and_backticks():
+    frame = _frame(("档位", "where((`数量` > 3) & (数量 <= 8), '中', '其他')"))
+    expected = np.where((frame["数量"] > 3) & (frame["数量"] <= 8), "中", "其他")
+    assert (frame["档位"] == expected).all()
+
+
+@pytest.mark.parametrize("text", ["__import__('os')", "a.b", "a if b else c", "foo(1)", "lambda: 1", "a +", "", "1 < a < 2"])
+def test_rejected_syntax(text):
+    with pytest.raises(ValueError):
+        compile_expression(text)
+
+
+def test_dependency_order_and_errors():
+    specs = fill_defaults(BASE + [
+        {"name": "含税", "type": "公式", "expression": "总金额 * 1.13"},
+        {"name": "总金额", "type": "公式", "expression": "数量 * 单价"},
+    ])
+    assert [spec["name"] for spec in evaluation_order(specs)][-2:] == ["总金额", "含税"]
+    assert expression_type(specs[3], specs) == "小数"
+    with pytest.raises(ValueError, match="循环引用"):
+        evaluation_order(fill_defaults([
+            {"name": "a", "type": "公式", "expression": "b"},
+            {"name": "b", "type": "公式", "expression": "a"},
+        ]))
+    with pytest.raises(ValueError, match="不存在的列"):
+        evaluation_order(fill_defaults([{"name": "a", "type": "公式", "expression": "b + 1"}]))
+
+
+# 公式文本中的逗号和空格有意义，不同的公式不能共用缓存的列
+def test_formula_cache_keys_keep_raw_text():
+    first = {"name": "f", "type": "公式", "custom_values": "where(s == 'a', 'p,q', 'z')"}
+    second = {"name": "f", "type": "公式", "custom_values": "where(s == 'a', 'p, q', 'z')"}
+    assert column_key(first, 10, 1) != column_key(second, 10, 1)
+
+    cache = DatasetCache()
+    specs = fill_defaults([{"name": "s", "type": "枚举", "custom_values": "a, b"}, first])
+    assert generate_frame(specs, 50, seed=1, column_cache=cache)["f"].isin(["p,q", "z"]).all()
+    specs[1] = second
+    assert generate_frame(specs, 50, seed=1, column_cache=cache)["f"].isin(["p, q", "z"]).all()
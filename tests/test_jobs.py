@@ -0,0 +1,124 @@
+import os
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from fakedata.engine import generate_chunks
+from fakedata.jobs import CANCELLED, DONE, JobManager
+from fakedata.schema import fill_defaults
+from fakedata.sinks import open_sink
+from fakedata.spill import SpillStore
+from fakedata.writers import EXPORT_FORMATS, write_chunks
+
+SPECS = fill_defaults([
+    {"name": "编号", "type": "自增ID"},
+    {"name": "数量", "type": "整数", "min": 1, "max": 10},
+    {"name": "状态", "type": "枚举", "custom_values": "已支付, 未支付"},
+])
+
+
+def _wait(job, timeout=30):
+    deadline = time.time() + timeout
+    while job.active:
+        assert time.time() < deadline, "后台任务没有结束"
+        time.sleep(0.01)
+    return job
+
+
+# 产出第一个分块后暂停，直到测试放行；用于在两个分块之间取消任务
+class PausedChunks:
+    def __init__(self, num_rows=3000, chunk_rows=1000):
+        self.num_rows = num_rows
+        self.chunk_rows = chunk_rows
+        self.paused = threading.Event()
+        self.resume = threading.Event()
+
+    def __call__(self):
+        for index, chunk in enumerate(generate_chunks(SPECS, self.num_rows, chunk_rows=self.chunk_rows, seed=1)):
+            if index == 1:
+                self.paused.set()
+                assert self.resume.wait(30)
+            yield chunk
+
+    # 提交任务，在第一个分块之后取消，等待任务结束
+    def cancel_after_first(self, manager, run):
+        job = manager.submit("a", self.num_rows, run)
+        assert self.paused.wait(30)
+        job.cancel()
+        self.resume.set()
+        return _wait(job)
+
+
+@pytest.fixture
+def manager():
+    manager = JobManager(max_workers=2, per_user=1, max_queue=2)
+    yield manager
+    manager.shutdown()
+
+
+def test_per_user_and_queue_limits(manager):
+    release = threading.Event()
+    first = manager.submit("a", 10, lambda job: release.wait(30))
+    with pytest.raises(RuntimeError):
+        manager.submit("a", 10, lambda job: None)
+    second = manager.submit("b", 10, lambda job: release.wait(30))
+    with pytest.raises(RuntimeError):
+        manager.submit("c", 10, lambda job: None)  # 排队的任务数已达上限
+    release.set()
+    assert _wait(first).status == DONE and _wait(second).status == DONE
+    assert _wait(manager.submit("a", 10, lambda job: 42)).result == 42
+
+
+def test_cancel_between_chunks(manager):
+    chunks = PausedChunks()
+    seen = []
+    job = chunks.cancel_after_first(manager, lambda job: seen.extend(job.track(chunks())))
+    assert job.status == CANCELLED
+    assert len(seen) == 1 and job.rows_done == 1000
+
+
+def test_cancel_while_queued(manager):
+    release = threading.Event()
+    manager.submit("a", 10, lambda job: release.wait(30))
+    manager.submit("b", 10, lambda job: release.wait(30))
+    ran = []
+    manager.per_user, manager.max_queue = 2, 3
+    queued = manager.submit("a", 10, lambda job: ran.append(job))
+    queued.cancel()
+    release.set()
+    assert _wait(queued).status == CANCELLED and not ran
+
+
+# 取消落盘或导出任务后，临时目录中不留下写了一半的 .partial 文件，也不登记数据集
+@pytest.mark.parametrize("target", ["spill", "csv", "csv.gz", "xlsx", "parquet", "arrow"])
+def test_cancelled_write_leaves_no_partial_file(manager, tmp_path, target):
+    store = SpillStore(root=tmp_path)
+    chunks = PausedChunks()
+    if target == "spill":
+        run = lambda job: store.put("key", job.track(chunks()))
+    else:
+        run = lambda job: store.put_file(
+            "key", lambda path: write_chunks(job.track(chunks()), path, target), suffix=EXPORT_FORMATS[target][1]
+        )
+    assert chunks.cancel_after_first(manager, run).status == CANCELLED
+    assert os.listdir(store.root) == []
+    assert store.get("key") is None and len(store) == 0 and store.size_bytes == 0
+
+
+# 取消写入数据库的任务后，已写入的分块保留，之后的分块不再写入，连接被关闭
+def test_cancelled_database_write(manager, tmp_path):
+    path = tmp_path / "data.db"
+    chunks = PausedChunks()
+
+    def run(job):
+        sink = open_sink(f"sqlite:///{path}", "orders", SPECS)
+        try:
+            return sink.write(job.track(chunks()))
+        finally:
+            sink.close()
+
+    assert chunks.cancel_after_first(manager, run).status == CANCELLED
+    with sqlite3.connect(path) as conn:
+        assert conn.execute('SELECT COUNT(*) FROM "orders"').fetchone()[0] == 1000
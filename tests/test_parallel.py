@@ -0,0 +1,19 @@
+import pandas as pd
+
+from fakedata.engine import generate_chunks
+from fakedata.parallel import generate_parallel
+from fakedata.schema import fill_defaults, get_preset
+
+
+# 多进程生成的每个分块都与单进程的 generate_chunks 完全一致，与进程数无关
+def test_parallel_matches_chunks():
+    specs = get_preset("电商") + fill_defaults([
+        {"name": "序号", "type": "随机ID", "min": 1, "max": 100_000},
+        {"name": "总价", "type": "公式", "expression": "round(数量 * 10, 2)"},
+        {"name": "数量", "type": "整数", "min": 1, "max": 5},
+    ])
+    expected = list(generate_chunks(specs, 2500, chunk_rows=700, seed=5))
+    for workers in (1, 3):
+        chunks = list(generate_parallel(specs, 2500, chunk_rows=700, seed=5, workers=workers))
+        assert len(chunks) == len(expected)
+        pd.testing.assert_frame_equal(pd.concat(chunks), pd.concat(expected))
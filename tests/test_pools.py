@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from fakedata import pools
+from fakedata.pools import DEFAULT_POOL_SIZE, PoolStore
+
+
+# 数据池比构建时要求的小（Faker 已无法生成更多独特值）时，新进程直接使用磁盘上的数据池，不再调用 Faker
+def test_exhausted_pool_is_not_rebuilt(tmp_path, monkeypatch):
+    country = PoolStore(tmp_path).load("country", "zh_CN", min_size=DEFAULT_POOL_SIZE)
+    assert len(country) < DEFAULT_POOL_SIZE
+
+    def rebuild(*args, **kwargs):
+        raise AssertionError("数据池被重新构建")
+
+    monkeypatch.setattr(pools, "precompute_values", rebuild)
+    store = PoolStore(tmp_path)
+    assert np.array_equal(store.load("country", "zh_CN", min_size=DEFAULT_POOL_SIZE), country)
+    sampled = store.sample("country", "zh_CN", 50, np.random.default_rng(1))
+    assert set(sampled) <= set(country)
+
+
+@pytest.mark.parametrize("count", [100, DEFAULT_POOL_SIZE + 500])
+def test_sampling_does_not_depend_on_pool_size(tmp_path, count):
+    expected = PoolStore(tmp_path).sample("name", "en_US", count, np.random.default_rng(7))
+    store = PoolStore(tmp_path)
+    bigger = store.build("name", "en_US", size=DEFAULT_POOL_SIZE + 2000)
+    assert len(bigger) == DEFAULT_POOL_SIZE + 2000
+    # 用固定种子构建的数据池互为前缀，更大的数据池不改变同一种子抽到的值
+    assert np.array_equal(store.sample("name", "en_US", count, np.random.default_rng(7)), expected)
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fakedata.relational import KeyIndex, generate_tables
+
+TABLES = {
+    "tables": [
+        {
+            "name": "用户",
+            "rows": 3000,
+            "columns": [{"name": "用户ID", "type": "UUID"}, {"name": "编号", "type": "随机ID", "min": 1, "max": 10_000}],
+        },
+        {
+            "name": "订单",
+            "fanout": {"column": "用户ID", "distribution": "poisson", "mean": 4, "min": 1, "max": 6},
+            "columns": [
+                {"name": "订单号", "type": "编码", "custom_values": "ORD-"},
+                {"name": "用户ID", "type": "外键", "references": "用户.用户ID"},
+                {"name": "金额", "type": "小数"},
+            ],
+        },
+        {
+            "name": "评论",
+            "rows": 5000,
+            "columns": [
+                {"name": "订单号", "type": "外键", "references": "订单.订单号"},
+                {"name": "用户编号", "type": "外键", "references": "用户.编号"},
+            ],
+        },
+    ],
+}
+
+
+def _generate(chunk_rows):
+    frames = {}
+    for table, chunks in generate_tables(TABLES, seed=3, chunk_rows=chunk_rows):
+        frames[table["name"]] = pd.concat(list(chunks), ignore_index=True)
+    return frames
+
+
+def test_foreign_keys_exist_in_parent():
+    frames = _generate(1000)
+    assert frames["订单"]["用户ID"].isin(frames["用户"]["用户ID"]).all()
+    assert frames["评论"]["订单号"].isin(frames["订单"]["订单号"]).all()
+    assert frames["评论"]["用户编号"].isin(frames["用户"]["编号"]).all()
+
+
+def test_fanout_counts_stay_within_bounds():
+    frames = _generate(1000)
+    counts = frames["订单"]["用户ID"].value_counts().reindex(frames["用户"]["用户ID"], fill_value=0)
+    assert counts.between(1, 6).all()
+    assert counts.max() == 6  # 泊松分布的长尾被截断到 max
+
+
+# 父表按不同的分块大小生成时，收集到的主键和子表引用的值都相同
+def test_chunking_does_not_change_keys():
+    whole = _generate(100_000)
+    chunked = _generate(700)
+    for name in whole:
+        pd.testing.assert_frame_equal(chunked[name], whole[name])
+
+
+@pytest.mark.parametrize("key_type, values", [
+    ("UUID", lambda: _generate(100_000)["用户"]["用户ID"]),
+    ("随机ID", lambda: np.arange(1000) * 7),
+    ("编码", lambda: np.array([f"ORD-{i:09d}" for i in range(1000)], dtype=object)),
+])
+def test_key_index_is_independent_of_chunking(key_type, values):
+    values = values()
+    whole = KeyIndex(key_type)
+    whole.append(values)
+    whole.freeze()
+    chunked = KeyIndex(key_type)
+    for start in range(0, len(values), 300):
+        chunked.append(values[start:start + 300])
+    chunked.freeze()
+    assert np.array_equal(whole.keys, chunked.keys)
+    positions = np.array([0, 5, len(values) - 1])
+    assert list(chunked.take(positions)) == list(np.asarray(values)[positions])
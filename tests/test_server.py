@@ -0,0 +1,69 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+import pytest
+
+from fakedata.cli import build_parser
+from fakedata.server import DataServer
+
+
+# 在临时端口上启动服务（用线程池代替进程池），发送一个原始 HTTP 请求，返回 (状态码, 原始响应)
+def _request(raw):
+    async def run():
+        data_server = DataServer(workers=1, chunk_rows=100)
+        data_server.executor = ThreadPoolExecutor(max_workers=1)
+        listener = await asyncio.start_server(data_server._handle, "127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(raw)
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            return response
+        finally:
+            listener.close()
+            data_server.executor.shutdown()
+
+    response = asyncio.run(run())
+    status = int(response.split(b" ", 2)[1]) if response else None
+    return status, response
+
+
+def _post(path, body, content_length=None):
+    data = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+    length = len(data) if content_length is None else content_length
+    return _request(f"POST {path} HTTP/1.1\r\nHost: x\r\nContent-Length: {length}\r\n\r\n".encode("latin-1") + data)
+
+
+def test_streams_ndjson():
+    status, response = _request(f"GET /generate?preset={quote('电商')}&rows=250&seed=1 HTTP/1.1\r\nHost: x\r\n\r\n".encode("ascii"))
+    assert status == 200
+    assert response.endswith(b"\r\n0\r\n\r\n")
+    assert response.count(b"\n{") == 250
+
+
+@pytest.mark.parametrize("body, content_length", [
+    ([{"name": "ID", "type": "随机ID", "min": 1, "max": 10}], None),  # 随机ID 的取值范围小于行数
+    ([{"name": "x", "type": "整数", "min": 10, "max": 1}], None),
+    ([{"name": "x", "type": "公式", "expression": "y + 1"}], None),
+    ([{"name": "x", "type": "枚举", "custom_values": "a:0, b:0"}], None),
+    ([1, 2, 3], None),
+    ("just a string", None),
+    ({"columns": [{"name": "x", "type": "整数"}], "locale": "xx_XX"}, None),
+    ({"columns": [{"name": "x", "type": "整数"}], "seed": -1}, None),
+    (b"{}", "abc"),
+])
+def test_rejects_invalid_jobs_before_streaming(body, content_length):
+    status, response = _post("/generate?rows=100", body, content_length)
+    assert status == 400
+    assert "error" in json.loads(response.split(b"\r\n\r\n", 1)[1])
+
+
+# 每个连接同时在途的分块数默认等于工作进程数，也可以通过命令行指定
+def test_max_inflight_defaults_to_workers():
+    assert DataServer(workers=6).max_inflight == 6
+    assert DataServer(workers=6, max_inflight=2).max_inflight == 2
+    assert build_parser().parse_args(["serve", "--workers", "4", "--max-inflight", "3"]).max_inflight == 3
@@ -0,0 +1,64 @@
+import sqlite3
+import threading
+
+import pandas as pd
+
+from fakedata.engine import generate_chunks
+from fakedata.schema import fill_defaults
+from fakedata.sinks import open_sink
+from fakedata.writers import export_bytes
+
+SPECS = fill_defaults([
+    {"name": "编号", "type": "自增ID"},
+    {"name": "数量", "type": "整数", "min": 1, "max": 10},
+    {"name": "单价", "type": "小数"},
+    {"name": "状态", "type": "枚举", "custom_values": "已支付, 未支付"},
+    {"name": "日期", "type": "日期"},
+])
+
+
+def _write(path, workers, **kwargs):
+    sink = open_sink(f"sqlite:///{path}", "orders", SPECS, **kwargs)
+    try:
+        return sink.write(generate_chunks(SPECS, 5000, chunk_rows=1000, seed=1), workers=workers)
+    finally:
+        sink.close()
+
+
+def _read(path):
+    with sqlite3.connect(path) as conn:
+        return pd.read_sql('SELECT * FROM "orders" ORDER BY "编号"', conn)
+
+
+def test_sqlite_round_trip(tmp_path):
+    path = tmp_path / "data.db"
+    assert _write(path, workers=1) == 5000
+    expected = pd.concat(generate_chunks(SPECS, 5000, chunk_rows=1000, seed=1), ignore_index=True)
+    pd.testing.assert_frame_equal(_read(path), expected.astype({"状态": object}), check_dtype=False)
+
+
+# 并行写入的线程数多于连接数时，线程等待其他线程归还连接而不是永久阻塞
+def test_more_workers_than_connections(tmp_path):
+    path = tmp_path / "data.db"
+    result = []
+    thread = threading.Thread(target=lambda: result.append(_write(path, workers=3, pool_size=1)), daemon=True)
+    thread.start()
+    thread.join(timeout=60)
+    assert result == [5000]
+    assert _read(path)["编号"].tolist() == list(range(1, 5001))
+
+
+# binary: true 的 ID 列在 SQLite 中保存为 16 字节的 BLOB，导出 CSV 时写成十六进制
+def test_binary_ids(tmp_path):
+    specs = fill_defaults([{"name": "uuid", "type": "UUIDv7", "binary": True}, {"name": "ulid", "type": "ULID", "binary": True}])
+    sink = open_sink(f"sqlite:///{tmp_path / 'ids.db'}", "ids", specs)
+    try:
+        sink.write(generate_chunks(specs, 100, chunk_rows=30, seed=1))
+    finally:
+        sink.close()
+    with sqlite3.connect(tmp_path / "ids.db") as conn:
+        assert conn.execute('SELECT DISTINCT typeof("uuid"), length("uuid"), typeof("ulid") FROM "ids"').fetchall() == [("blob", 16, "blob")]
+
+    text = export_bytes(generate_chunks(specs, 3, seed=1), "csv").decode("utf-8").splitlines()
+    assert text[0] == "uuid,ulid"
+    assert all(len(value) == 32 and int(value, 16) >= 0 for line in text[1:] for value in line.split(","))
@@ -0,0 +1,80 @@
+import os
+
+import pandas as pd
+
+from fakedata.engine import generate_chunks
+from fakedata.schema import fill_defaults
+from fakedata.spill import SpillStore
+
+SPECS = fill_defaults([
+    {"name": "编号", "type": "自增ID"},
+    {"name": "数量", "type": "整数", "min": 1, "max": 10},
+    {"name": "单价", "type": "小数"},
+    {"name": "状态", "type": "枚举", "custom_values": "已支付, 未支付"},
+    {"name": "日期", "type": "日期"},
+])
+
+
+def _chunks(num_rows=2500, chunk_rows=1000, seed=1):
+    return list(generate_chunks(SPECS, num_rows, chunk_rows=chunk_rows, seed=seed))
+
+
+def _write_bytes(path, data):
+    with open(path, "wb") as file:
+        file.write(data)
+
+
+def test_iter_chunks_round_trip(tmp_path):
+    chunks = _chunks()
+    dataset = SpillStore(root=tmp_path).put("key", iter(chunks))
+    assert len(dataset) == 2500 and dataset.columns == [spec["name"] for spec in SPECS]
+    read = list(dataset.iter_chunks())
+    assert [len(chunk) for chunk in read] == [1000, 1000, 500]
+    for written, chunk in zip(chunks, read):
+        pd.testing.assert_frame_equal(chunk, written.reset_index(drop=True))
+    pd.testing.assert_frame_equal(dataset.to_pandas(), pd.concat(chunks, ignore_index=True))
+
+
+# 分页和抽样读出的行以原始行号为索引，内容与整张表中对应的行相同
+def test_page_and_sample_keep_row_numbers(tmp_path):
+    dataset = SpillStore(root=tmp_path).put("key", iter(_chunks()))
+    expected = pd.concat(_chunks(), ignore_index=True)
+
+    page = dataset.page(1500, 100)
+    assert list(page.index) == list(range(1500, 1600))
+    pd.testing.assert_frame_equal(page, expected.iloc[1500:1600])
+    assert list(dataset.page(2450, 100).index) == list(range(2450, 2500))
+
+    sample = dataset.sample(200, seed=3)
+    assert len(sample) == 200 and sample.index.is_unique and sample.index.is_monotonic_increasing
+    pd.testing.assert_frame_equal(sample, expected.iloc[sample.index])
+    assert list(dataset.sample(200, seed=3).index) == list(sample.index)
+    assert len(dataset.sample(10_000)) == 2500
+
+
+# 磁盘占用超过预算时删除最早使用的文件；读取会把数据集标记为最近使用
+def test_lru_eviction_under_max_bytes(tmp_path):
+    probe = SpillStore(root=tmp_path)
+    size = os.path.getsize(probe.put("probe", iter(_chunks())).path)
+    store = SpillStore(root=tmp_path, max_bytes=size * 2 + size // 2)
+
+    first = store.put("a", iter(_chunks(seed=1)))
+    store.put("b", iter(_chunks(seed=2)))
+    assert store.get("a") is first  # a 成为最近使用，b 最早
+    store.put("c", iter(_chunks(seed=3)))
+    assert store.get("b") is None and store.get("a") is first and store.get("c") is not None
+    assert len(store) == 2 and store.size_bytes <= store.max_bytes
+    assert sorted(os.listdir(store.root)) == sorted(
+        os.path.basename(store.get(key).path) for key in ("a", "c")
+    )
+
+    # 同一个键重新写入时替换旧文件，不重复计入磁盘占用
+    store.put("c", iter(_chunks(seed=4)))
+    assert len(store) == 2 and len(os.listdir(store.root)) == 2
+    assert store.size_bytes == sum(os.path.getsize(store.get(key).path) for key in ("a", "c"))
+
+    # 单个文件超过预算时仍然保留最新写入的文件
+    store.max_bytes = 1
+    store.put_file("export", lambda path: _write_bytes(path, b"x" * 100), suffix=".csv")
+    assert len(store) == 1 and store.get("export").read() == b"x" * 100
+    assert os.listdir(store.root) == [os.path.basename(store.get("export").path)]
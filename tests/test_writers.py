@@ -0,0 +1,78 @@
+import io
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from openpyxl import load_workbook
+
+from fakedata import writers
+from fakedata.engine import generate_chunks
+from fakedata.schema import fill_defaults
+from fakedata.writers import write_chunks
+
+SPECS = fill_defaults([
+    {"name": "编号", "type": "自增ID"},
+    {"name": "数量", "type": "整数", "min": 1, "max": 10},
+    {"name": "单价", "type": "小数"},
+    {"name": "状态", "type": "枚举", "custom_values": "已支付, 未支付, 已退款"},
+    {"name": "日期", "type": "日期"},
+])
+
+
+def _chunks():
+    return generate_chunks(SPECS, 2500, chunk_rows=1000, seed=1)
+
+
+def _expected():
+    return pd.concat(_chunks(), ignore_index=True)
+
+
+def _write(fmt):
+    buffer = io.BytesIO()
+    assert write_chunks(_chunks(), buffer, fmt) == 2500
+    buffer.seek(0)
+    return buffer
+
+
+@pytest.mark.parametrize("fmt, compression", [("csv", None), ("csv.gz", "gzip")])
+def test_csv_round_trip(fmt, compression):
+    frame = pd.read_csv(_write(fmt), compression=compression)
+    expected = _expected()
+    pd.testing.assert_frame_equal(frame, expected.astype({"状态": object}), check_dtype=False)
+
+
+# 枚举列以字典编码写出，读回时仍为 category 类型；每个分块对应一个行组或记录批
+def test_parquet_round_trip_keeps_dictionary_encoding():
+    parquet = pq.ParquetFile(_write("parquet"))
+    assert parquet.metadata.num_row_groups == 3
+    assert pa.types.is_dictionary(parquet.schema_arrow.field("状态").type)
+    assert "RLE_DICTIONARY" in parquet.metadata.row_group(0).column(3).encodings
+    pd.testing.assert_frame_equal(parquet.read().to_pandas(), _expected())
+
+
+def test_arrow_round_trip_keeps_dictionary_encoding():
+    reader = pa.ipc.open_file(_write("arrow"))
+    assert reader.num_record_batches == 3
+    assert pa.types.is_dictionary(reader.schema.field("状态").type)
+    pd.testing.assert_frame_equal(reader.read_all().to_pandas(), _expected())
+
+
+# 超过单个工作表的行数上限时续写到新的工作表，每个工作表都带表头
+def test_xlsx_rolls_over_to_new_sheets(monkeypatch):
+    monkeypatch.setattr(writers, "XLSX_MAX_ROWS", 1000)
+    workbook = load_workbook(_write("xlsx"), read_only=True)
+    assert workbook.sheetnames == ["Generated Data", "Generated Data 2", "Generated Data 3"]
+    rows = [list(sheet.values) for sheet in workbook.worksheets]
+    assert [len(sheet_rows) for sheet_rows in rows] == [1001, 1001, 501]
+    expected = _expected()
+    header = list(expected.columns)
+    assert all(sheet_rows[0] == tuple(header) for sheet_rows in rows)
+    frame = pd.DataFrame([row for sheet_rows in rows for row in sheet_rows[1:]], columns=header)
+    pd.testing.assert_frame_equal(frame, expected.astype({"状态": object}), check_dtype=False)
+
+
+def test_xlsx_without_rows_has_one_sheet():
+    buffer = io.BytesIO()
+    assert write_chunks(iter([]), buffer, "xlsx") == 0
+    assert load_workbook(buffer, read_only=True).sheetnames == ["Generated Data"]